@@ -0,0 +1,47 @@
+import threading
+
+
+# Rules are checked against the attempt that was just recorded and the
+# user's running totals from `user_stats` (already including that attempt).
+RULES = [
+    ('FIRST_WIN', lambda attempt, stats: stats['attempts_count'] == 1),
+    ('NO_WALL_BREAK', lambda attempt, stats: attempt['walls_broken'] == 0),
+    ('FAST_FINISH', lambda attempt, stats: attempt['time_left'] >= 30),
+    ('WALL_BREAKER', lambda attempt, stats: stats['total_walls_broken'] >= 10),
+]
+
+
+def earned_ids(ids, attempt, stats):
+    return [ids[code] for code, rule in RULES if code in ids and rule(attempt, stats)]
+
+
+class AchievementCatalog:
+    """code -> id map for the `achievements` table, loaded once per process."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._ids = None
+
+    def _load(self, cursor):
+        cursor.execute("SELECT code, id FROM achievements")
+        self._ids = dict(cursor.fetchall())
+
+    def ids(self, cursor=None):
+        # Pass the caller's cursor when already holding a connection, so a
+        # cold cache doesn't need a second one from the pool
+        if self._ids is None:
+            with self._lock:
+                if self._ids is None:
+                    if cursor is not None:
+                        self._load(cursor)
+                    else:
+                        with self.pool.cursor() as (conn, own_cursor):
+                            self._load(own_cursor)
+        return self._ids
+
+    def invalidate(self):
+        self._ids = None
+
+    def earned(self, attempt, stats, cursor=None):
+        return earned_ids(self.ids(cursor), attempt, stats)
@@ -1,44 +1,113 @@
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for # type: ignore
 import random
-import mysql.connector # type: ignore
 from mysql.connector import Error # type: ignore
 from flask_cors import CORS # type: ignore
-from werkzeug.security import generate_password_hash, check_password_hash # type: ignore
 from datetime import timedelta
+import os
+import atexit
+import functools
+import hmac
+
+from db import ConnectionPool
+from question_bank import QuestionBank
+from achievements import AchievementCatalog
+from attempt_writer import AttemptWriter, write_attempts
+from leaderboard import Leaderboard
+from progress_cache import ProgressCache
+from profile_cache import ProfileCache
+from passwords import PasswordHasher, HasherBusy
+from metrics import Metrics
+from static_assets import StaticAssets
+from page_cache import PageCache
+from settings import config, levels
 
 app = Flask(__name__)
 
 CORS(app)
 app.secret_key = 'supersecretkey'
 
-# Level Configurations
-levels = {
-    1: {"cols": 10, "rows": 10, "difficulty": "easy", "wall_break_limit": 10, "time_limit": 50},
-    2: {"cols": 20, "rows": 20, "difficulty": "medium", "wall_break_limit": 7, "time_limit": 120},
-    3: {"cols": 30, "rows": 30, "difficulty": "hard", "wall_break_limit": 5, "time_limit": 180},
-    4: {"cols": 40, "rows": 40, "difficulty": "extreme", "wall_break_limit": 3, "time_limit": 200}
-}
-
-# MySQL Configuration
-config = {
-    "host": "localhost",
-    "user": "root",
-    "password": "root",
-    "database": "maze_game",
-    "charset": "utf8mb4",
-    "collation": "utf8mb4_unicode_ci",
-    "use_unicode": True
-}
-
-
-def get_db_connection():
-    print("CONFIG TYPE:", type(config), config)
-    return mysql.connector.connect(**config)
+# Fingerprinted, gzipped static files (after `python build_static.py`) and
+# rendered pages that don't depend on who is asking
+StaticAssets(app.static_folder).install(app)
+page_cache = PageCache(app)
+
+
+
+# Request/query latency, exported at /metrics
+metrics = Metrics(slow_query_seconds=float(os.environ.get("MAZE_SLOW_QUERY_MS", 100)) / 1000)
+metrics.install(app)
+
+db_pool = ConnectionPool(
+    config,
+    size=int(os.environ.get("MAZE_DB_POOL_SIZE", 10)),
+    timeout=float(os.environ.get("MAZE_DB_POOL_TIMEOUT", 5)),
+    observer=metrics.observe_query,
+)
+app.extensions["db_pool"] = db_pool
+metrics.add_gauges("db_pool", db_pool.stats)
+
+# Password hashing runs on its own bounded pool, off the request workers
+password_hasher = PasswordHasher(
+    method=os.environ.get("MAZE_HASH_METHOD", "scrypt:32768:8:1"),
+    workers=int(os.environ.get("MAZE_HASH_WORKERS", os.cpu_count() or 2)),
+    max_pending=int(os.environ.get("MAZE_HASH_MAX_PENDING", 32)),
+    timeout=float(os.environ.get("MAZE_HASH_TIMEOUT", 5)),
+    use_processes=os.environ.get("MAZE_HASH_PROCESSES") == "1",
+)
+
+# In-memory question cache so gameplay routes skip MySQL
+question_bank = QuestionBank(
+    db_pool,
+    ttl=int(os.environ.get("MAZE_QUESTION_TTL", 600)),
+    check_interval=int(os.environ.get("MAZE_QUESTION_CHECK_INTERVAL", 30)),
+)
+achievement_catalog = AchievementCatalog(db_pool)
+
+# In-memory rankings, seeded from `scores` on first use
+leaderboard = Leaderboard(db_pool, ttl=int(os.environ.get("MAZE_LEADERBOARD_TTL", 300)))
+
+# users.max_level_unlocked, cached per user (write-through on next_level)
+progress_cache = ProgressCache(
+    db_pool,
+    max_entries=int(os.environ.get("MAZE_PROGRESS_CACHE_SIZE", 10000)),
+    ttl=int(os.environ.get("MAZE_PROGRESS_CACHE_TTL", 60)),
+)
+metrics.add_gauges("progress_cache", progress_cache.stats)
+
+# Profile page summary (totals + achievements), versioned by attempts_count
+profile_cache = ProfileCache(
+    db_pool,
+    max_entries=int(os.environ.get("MAZE_PROFILE_CACHE_SIZE", 10000)),
+    ttl=int(os.environ.get("MAZE_PROFILE_CACHE_TTL", 120)),
+)
+metrics.add_gauges("profile_cache", profile_cache.stats)
+
+
+def on_attempts_committed(events):
+    for e in events:
+        leaderboard.record(e['user_id'], e['level'], e['score'])
+        profile_cache.invalidate(e['user_id'])
+
+
+# Optional write-behind for submit_score (MAZE_WRITE_BEHIND=1)
+attempt_writer = None
+if os.environ.get("MAZE_WRITE_BEHIND") == "1":
+    attempt_writer = AttemptWriter(
+        db_pool,
+        achievement_catalog,
+        max_queue=int(os.environ.get("MAZE_WRITE_BEHIND_QUEUE", 10000)),
+        batch_size=int(os.environ.get("MAZE_WRITE_BEHIND_BATCH", 500)),
+        flush_interval=float(os.environ.get("MAZE_WRITE_BEHIND_INTERVAL", 1.0)),
+        on_commit=on_attempts_committed,
+    )
+    attempt_writer.start()
+    atexit.register(attempt_writer.stop)
+    metrics.add_gauges("write_behind", attempt_writer.stats)
 
 @app.route('/')
 def landing():
  
-    return render_template('landing.html')
+    return page_cache.render('landing.html')
 
 @app.route('/start_game')
 def start_game():
@@ -62,29 +131,47 @@ def login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        if user and check_password_hash(user['password'], password):
+        with db_pool.cursor(dictionary=True) as (conn, cursor):
+            cursor.execute("""
+                SELECT u.*, COALESCE(s.attempts_count, 0) AS attempts_count
+                FROM users u
+                LEFT JOIN user_stats s ON s.user_id = u.id
+                WHERE u.username = %s
+            """, (username,))
+            user = cursor.fetchone()
+        try:
+            valid = user is not None and password_hasher.verify(user['password'], password)
+        except HasherBusy:
+            return page_cache.render('login.html', status=503, error='Server busy, please try again')
+        if valid and password_hasher.needs_rehash(user['password']):
+            # Transparently move old hashes to the current method/cost; the
+            # upgrade is optional, so a busy hasher just defers it
+            try:
+                new_hash = password_hasher.hash(password)
+            except HasherBusy:
+                new_hash = None
+            if new_hash is not None:
+                with db_pool.cursor() as (conn, cursor):
+                    cursor.execute("UPDATE users SET password = %s WHERE id = %s", (new_hash, user['id']))
+                    conn.commit()
+        if valid:
             session['user_id'] = user['id']
+            session['profile_version'] = user['attempts_count']
             return redirect(url_for('level_select'))
-        return render_template('login.html', error='Invalid credentials')
-    return render_template('login.html')
+        return page_cache.render('login.html', error='Invalid credentials')
+    return page_cache.render('login.html')
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
         username = request.form['username']
-        password = generate_password_hash(request.form['password'])
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, password))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        try:
+            password = password_hasher.hash(request.form['password'])
+        except HasherBusy:
+            return render_template('register.html', error='Server busy, please try again'), 503
+        with db_pool.cursor() as (conn, cursor):
+            cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, password))
+            conn.commit()
         return redirect(url_for('login'))
     return render_template('register.html')
 
@@ -94,31 +181,131 @@ def logout():
     return redirect(url_for('login'))
 
 
+def question_payload(question):
+    return {
+        'id': question['id'],
+        'question': question['question'],
+        'options': {
+            'A': question['option_a'],
+            'B': question['option_b'],
+            'C': question['option_c'],
+            'D': question['option_d']
+        },
+    }
+
+# The question and answer routes are shared with async_app.py: each helper
+# takes the session (Flask's or Quart's) and/or the parsed JSON body and
+# returns (body, status) for the route to jsonify.
+
+def question_result(session_data):
+    level = session_data.get('current_level', 1)
+    question = question_bank.random_question(levels.get(level, levels[1])['difficulty'])
+    if question is None:
+        return {'error': 'No questions available in the database'}, 404
+    return question_payload(question), 200
+
+MAX_QUESTION_BATCH = 20
+
+def questions_result(session_data, n):
+    level = session_data.get('current_level', 1)
+    difficulty = levels.get(level, levels[1])['difficulty']
+    n = min(max(n, 1), MAX_QUESTION_BATCH)
+
+    # No repeats within a run; start over once the bank is used up
+    seen = session_data.get('seen_questions', [])
+    questions = question_bank.sample(difficulty, n, exclude=seen)
+    if not questions and seen:
+        seen = []
+        questions = question_bank.sample(difficulty, n)
+    if not questions:
+        return {'error': 'No questions available in the database'}, 404
+
+    session_data['seen_questions'] = seen + [q['id'] for q in questions]
+    return {'questions': [question_payload(q) for q in questions]}, 200
+
+def answer_result(data):
+    if not isinstance(data, dict):
+        return {'error': 'expected a JSON object'}, 400
+    qid = data.get('id')
+    if not isinstance(qid, int) or isinstance(qid, bool):
+        return {'error': 'id must be an integer'}, 400
+    correct = question_bank.check_answer(qid, data.get('answer'))
+    if correct is None:
+        return {'error': 'Unknown question'}, 404
+    return {'correct': correct}, 200
+
+MAX_BATCH_ANSWERS = 100
+
+def answers_result(data):
+    # Body: {"answers": [{"id": 1, "answer": "B"}, ...]}
+    items = data.get('answers', []) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return {'error': 'answers must be a list of {id, answer} objects'}, 400
+    results = []
+    for item in items[:MAX_BATCH_ANSWERS]:
+        results.append({'id': item.get('id'),
+                        'correct': question_bank.check_answer(item.get('id'), item.get('answer'))})
+    return {'results': results}, 200
+
 @app.route('/get_question')
 def get_question():
+    body, status = question_result(session)
+    return jsonify(body), status
+
+@app.route('/get_questions')
+def get_questions():
+    body, status = questions_result(session, request.args.get('n', 5, type=int))
+    return jsonify(body), status
+
+# Only sidewinder is fully vectorised; the other generators walk the maze
+# cell by cell holding the GIL (seconds at 1000x1000), so keep them small
+MAX_SEQUENTIAL_MAZE = 100
+VECTORISED_ALGORITHMS = {'sidewinder'}
+
+@app.route('/get_maze')
+def get_maze():
+    # maze_engine needs numpy; imported here so the rest of the app runs without it
+    import maze_engine
+
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+
     level = session.get('current_level', 1)
-    difficulty = levels.get(level, levels[1])['difficulty']
-    
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM questions WHERE difficulty = %s ORDER BY RAND() LIMIT 1", (difficulty,))
-    question = cursor.fetchone()
-    cursor.close()
-    conn.close()
-
-    if question:
-        return jsonify({
-            'id': question['id'],
-            'question': question['question'],
-            'options': {
-                'A': question['option_a'],
-                'B': question['option_b'],
-                'C': question['option_c'],
-                'D': question['option_d']
-            },
-        })
-    else:
-        return jsonify({'error': 'No questions available in the database'}), 404
+    level_config = levels.get(level, levels[1])
+    cols = request.args.get('cols', level_config['cols'], type=int)
+    rows = request.args.get('rows', level_config['rows'], type=int)
+    algorithm = request.args.get('algorithm', maze_engine.DEFAULT_ALGORITHM)
+    seed = request.args.get('seed', type=int)
+    # Runs only count as verifiable on a maze the server chose: the level's
+    # size and algorithm and a seed the client didn't pick (and so can't
+    # have solved in advance)
+    custom = (seed is not None or algorithm != maze_engine.DEFAULT_ALGORITHM
+              or (cols, rows) != (level_config['cols'], level_config['rows']))
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    if algorithm not in VECTORISED_ALGORITHMS and max(cols, rows) > MAX_SEQUENTIAL_MAZE:
+        return jsonify({'error': 'Mazes above %dx%d need the sidewinder algorithm'
+                                 % (MAX_SEQUENTIAL_MAZE, MAX_SEQUENTIAL_MAZE)}), 400
+
+    try:
+        walls = maze_engine.generate(cols, rows, seed=seed, algorithm=algorithm)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Remember what was served so the run can be rebuilt server-side;
+    # a new maze is a new run, so questions may repeat again
+    session['maze'] = {'cols': cols, 'rows': rows, 'seed': seed, 'algorithm': algorithm, 'custom': custom}
+    session['seen_questions'] = []
+
+    return jsonify({
+        'cols': cols,
+        'rows': rows,
+        'seed': seed,
+        'algorithm': algorithm,
+        'encoding': 'nibble-base64',
+        'walls': maze_engine.encode(walls)
+    })
 
 @app.route('/get_level_config')
 def get_level_config():
@@ -133,17 +320,12 @@ def next_level():
 
     if current < 4:
         session['current_level'] = current + 1
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET max_level_unlocked = GREATEST(max_level_unlocked, %s) WHERE id = %s",
-                       (session['current_level'], user_id))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        session['progress_version'] = progress_cache.unlock(user_id, session['current_level'])
 
         return jsonify({'level': session['current_level'], 'message': 'Level up!'})
 
+    return jsonify({'level': current, 'message': 'All levels completed!'})
+
 @app.route('/reset_game')
 def reset_game():
     session['current_level'] = 1
@@ -156,14 +338,7 @@ def get_unlocked_levels():
         # Instead of returning a login page (HTML), return a JSON error
         return jsonify({'error': 'Not logged in'}), 401
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT max_level_unlocked FROM users WHERE id = %s", (user_id,))
-    result = cursor.fetchone()
-    cursor.close()
-    conn.close()
-
-    max_unlocked = result[0] if result else 1
+    max_unlocked = progress_cache.get(user_id, session.get('progress_version', 0)) or 1
 
     return jsonify({
         'unlocked_levels': max_unlocked,
@@ -175,12 +350,9 @@ def get_unlocked_levels():
 @app.route('/select_level/<int:level>')
 def select_level(level):
     user_id = session.get('user_id')
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT max_level_unlocked FROM users WHERE id = %s", (user_id,))
-    max_unlocked = cursor.fetchone()[0]
-    cursor.close()
-    conn.close()
+    if not user_id:
+        return redirect(url_for('login'))
+    max_unlocked = progress_cache.get(user_id, session.get('progress_version', 0)) or 1
 
     if level <= max_unlocked:
         # Always reset timer by resetting session current_level
@@ -193,23 +365,53 @@ def select_level(level):
 def level_select():
     if 'user_id' not in session:
         return redirect(url_for('login'))
-    return render_template('select_level.html')  # Create this file
+    return page_cache.render('select_level.html')
 
 
 @app.route('/validate_answer', methods=['POST'])
 def validate_answer():
-    data = request.json
-    qid = data['id']
-    answer = data['answer']
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT correct_option FROM questions WHERE id=%s", (qid,))
-    correct = cursor.fetchone()[0]
-    cursor.close()
-    conn.close()
-
-    return jsonify({'correct': answer == correct})
+    body, status = answer_result(request.json or {})
+    return jsonify(body), status
+
+@app.route('/validate_answers', methods=['POST'])
+def validate_answers():
+    body, status = answers_result(request.json or {})
+    return jsonify(body), status
+
+# Size guard only; verifier.py enforces the real moves-per-second limit
+MAX_MOVE_LOG = 100000
+
+def run_log(data, maze):
+    # What verifier.py replays. `maze` is the session's record of what
+    # /get_maze served; a seed the client reports but we didn't serve is ignored.
+    moves = data.get('moves')
+    move_count = data.get('move_count')
+    if not isinstance(moves, str) or not isinstance(move_count, int) \
+            or not 0 <= move_count <= MAX_MOVE_LOG or len(moves) > MAX_MOVE_LOG // 3 + 4:
+        moves, move_count = '', 0
+    if maze is not None and (data.get('seed') != maze['seed'] or maze.get('custom')):
+        maze = None  # recorded as unverifiable
+    return {'maze': maze, 'moves': moves, 'move_count': move_count}
+
+def score_fields(data, level):
+    # Bounded by the level, so nothing impossible (or out of column range)
+    # gets queued; one bad run would otherwise fail a whole write batch.
+    # None if the body isn't a JSON object or a field is out of range
+    if not isinstance(data, dict):
+        return None
+    config = levels.get(level, levels[1])
+    limits = {'score': config['time_limit'] * 10, 'walls_broken': config['wall_break_limit'],
+              'time_left': config['time_limit']}
+    fields = {}
+    for key, limit in limits.items():
+        try:
+            value = int(data.get(key, 0))
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= value <= limit:
+            return None
+        fields[key] = value
+    return fields
 
 @app.route('/submit_score', methods=['POST'])
 def submit_score():
@@ -217,130 +419,153 @@ def submit_score():
         return jsonify({'error': 'Not logged in'}), 401
 
     data = request.json or {}
-    score = int(data.get('score', 0))
-    walls_broken = int(data.get('walls_broken', 0))
-    time_left = int(data.get('time_left', 0))
     level = session.get('current_level', 1)
     user_id = session['user_id']
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # 1) Insert attempt (history)
-        cursor.execute("""
-            INSERT INTO attempts (user_id, level, score, walls_broken, time_left)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (user_id, level, score, walls_broken, time_left))
-
-        # 2) Upsert into scores (store player's best total or best per-level - adjust as needed)
-        # Example: keep best score per user across all levels in 'scores' table
-        cursor.execute("""
-            INSERT INTO scores (user_id, level, score)
-            VALUES (%s, %s, %s)
-            ON DUPLICATE KEY UPDATE score = GREATEST(score, VALUES(score))
-        """, (user_id, level, score))
-
-        # 3) Check & award achievements
-        # Award FIRST_WIN if this is the user's first win (count attempts)
-        cursor.execute("SELECT COUNT(*) FROM attempts WHERE user_id = %s", (user_id,))
-        attempts_count = cursor.fetchone()[0]
-
-        # helper: award achievement by code
-        def award(code):
-            cursor.execute("SELECT id FROM achievements WHERE code = %s", (code,))
-            row = cursor.fetchone()
-            if not row:
-                return
-            ach_id = row[0]
-            try:
-                cursor.execute("""
-                    INSERT INTO user_achievements (user_id, achievement_id)
-                    VALUES (%s, %s)
-                """, (user_id, ach_id))
-            except Exception:
-                # ignore unique constraint or other issues
-                pass
-
-        # FIRST_WIN
-        if attempts_count == 1:
-            award('FIRST_WIN')
-
-        # NO_WALL_BREAK: this attempt had zero walls broken
-        if walls_broken == 0:
-            award('NO_WALL_BREAK')
-
-        # FAST_FINISH: >= 30s left
-        if time_left >= 30:
-            award('FAST_FINISH')
-
-        # WALL_BREAKER: count total walls broken across attempts; award when >=10
-        cursor.execute("SELECT COALESCE(SUM(walls_broken),0) FROM attempts WHERE user_id = %s", (user_id,))
-        total_wb = cursor.fetchone()[0]
-        if total_wb >= 10:
-            award('WALL_BREAKER')
-
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        print("🔥 submit_score ERROR:", e)
-        return jsonify({'error': str(e)}), 500
-    finally:
-        cursor.close()
-        conn.close()
+    fields = score_fields(data, level)
+    if fields is None:
+        return jsonify({'error': 'Invalid score, walls_broken or time_left'}), 400
+    score = fields['score']
+
+    # The served maze is single-use: a second submit can't replay against it
+    event = dict(fields, user_id=user_id, level=level,
+                 run=run_log(data, session.pop('maze', None)))
+
+    # Write-behind mode: hand the run to the background flusher and return.
+    # If the queue is full we fall through and write it inline.
+    if attempt_writer is not None and attempt_writer.submit(event):
+        session['profile_version'] = session.get('profile_version', 0) + 1
+        return jsonify({'message': 'Score queued', 'score': score}), 202
+
+    with db_pool.cursor() as (conn, cursor):
+        try:
+            write_attempts(cursor, [event], achievement_catalog)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print("🔥 submit_score ERROR:", e)
+            return jsonify({'error': str(e)}), 500
+    on_attempts_committed([event])
+    session['profile_version'] = session.get('profile_version', 0) + 1
 
     return jsonify({'message': 'Score submitted and recorded', 'score': score})
 
+def leaderboard_response(level):
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    rows, total = leaderboard.page(level, offset, limit)
+
+    me = None
+    if 'user_id' in session:
+        rank, score = leaderboard.rank(session['user_id'], level)
+        me = {'rank': rank, 'score': score}
+
+    return jsonify({'level': level, 'total': total, 'offset': offset, 'limit': limit,
+                    'entries': rows, 'me': me})
+
+@app.route('/leaderboard')
+def global_leaderboard():
+    return leaderboard_response(None)
+
+@app.route('/leaderboard/<int:level>')
+def level_leaderboard(level):
+    if level not in levels:
+        return jsonify({'error': 'Unknown level'}), 404
+    return leaderboard_response(level)
+
+# Operational endpoints (/metrics, pool and write-behind stats) reveal query
+# fingerprints and pool internals, so they answer 404 unless the caller
+# sends `Authorization: Bearer $MAZE_OPS_TOKEN` or connects from an address
+# in MAZE_OPS_ALLOW (comma-separated). Both are unset by default.
+OPS_TOKEN = os.environ.get("MAZE_OPS_TOKEN", "")
+OPS_ALLOW = {a.strip() for a in os.environ.get("MAZE_OPS_ALLOW", "").split(",") if a.strip()}
+
+def ops_allowed(authorization, remote_addr):
+    if remote_addr in OPS_ALLOW:
+        return True
+    return bool(OPS_TOKEN) and hmac.compare_digest((authorization or "").encode(), ("Bearer " + OPS_TOKEN).encode())
+
+def ops_only(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ops_allowed(request.headers.get('Authorization'), request.remote_addr):
+            return jsonify({'error': 'Not found'}), 404
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/metrics')
+@ops_only
+def metrics_endpoint():
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/pool_stats')
+@ops_only
+def pool_stats():
+    return jsonify(db_pool.stats())
+
+@app.route('/write_behind_stats')
+@ops_only
+def write_behind_stats():
+    if attempt_writer is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(attempt_writer.stats(), enabled=True))
+
 @app.route('/profile')
 def profile():
     if 'user_id' not in session:
         return redirect(url_for('login'))
 
+    summary = profile_cache.get(session['user_id'], session.get('profile_version', 0))
+    if summary is None:
+        return redirect(url_for('login'))
+    session['profile_version'] = max(session.get('profile_version', 0), summary['stats']['attempts_count'])
+
+    # Attempt history is paged in by the page itself from /profile/attempts
+    return render_template('profile.html', **summary)
+
+MAX_ATTEMPTS_PAGE = 100
+
+@app.route('/profile/attempts')
+def profile_attempts():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+
     user_id = session['user_id']
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Get user info
-    cursor.execute("SELECT id, username FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-
-    # Get user's achievements (join)
-    cursor.execute("""
-        SELECT a.code, a.title, a.description, ua.awarded_at
-        FROM user_achievements ua
-        JOIN achievements a ON ua.achievement_id = a.id
-        WHERE ua.user_id = %s
-        ORDER BY ua.awarded_at DESC
-    """, (user_id,))
-    user_achievements = cursor.fetchall()
-
-    # Get all defined achievements (to show locked ones)
-    cursor.execute("SELECT code, title, description FROM achievements ORDER BY id")
-    all_achievements = cursor.fetchall()
-
-    # Get user's attempts (history)
-    cursor.execute("""
-        SELECT level, score, walls_broken, time_left, created_at
-        FROM attempts
-        WHERE user_id = %s
-        ORDER BY created_at DESC
-        LIMIT 100
-    """, (user_id,))
-    attempts = cursor.fetchall()
-
-    # Optional: aggregate stats
-    cursor.execute("SELECT SUM(score) as total_score, COUNT(*) as attempts_count FROM attempts WHERE user_id = %s", (user_id,))
-    stats = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
-
-    return render_template('profile.html',
-                           user=user,
-                           user_achievements=user_achievements,
-                           all_achievements=all_achievements,
-                           attempts=attempts,
-                           stats=stats)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_ATTEMPTS_PAGE)
+    before_created_at = request.args.get('before_created_at')
+    before_id = request.args.get('before_id', type=int)
+
+    # Keyset pagination on (created_at, id): each page starts right after the
+    # last row of the previous one, so deep pages cost the same as the first
+    with db_pool.cursor(dictionary=True) as (conn, cursor):
+        if before_created_at and before_id is not None:
+            cursor.execute("""
+                SELECT id, level, score, walls_broken, time_left, created_at
+                FROM attempts
+                WHERE user_id = %s
+                  AND (created_at < %s OR (created_at = %s AND id < %s))
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            """, (user_id, before_created_at, before_created_at, before_id, limit + 1))
+        else:
+            cursor.execute("""
+                SELECT id, level, score, walls_broken, time_left, created_at
+                FROM attempts
+                WHERE user_id = %s
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            """, (user_id, limit + 1))
+        rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for row in rows:
+        row['created_at'] = row['created_at'].isoformat(sep=' ')
+
+    next_page = None
+    if has_more:
+        next_page = {'before_created_at': rows[-1]['created_at'], 'before_id': rows[-1]['id']}
+
+    return jsonify({'attempts': rows, 'next': next_page})
 
 if __name__ == '__main__':
         app.run(debug=True, use_reloader=False)
@@ -0,0 +1,182 @@
+"""asyncio mode: the gameplay endpoints served by Quart on mysql.connector.aio.
+
+The hot routes below are async handlers on an AsyncConnectionPool, so one
+process can keep many players' DB round trips in flight at once. Every
+other route is still the Flask app from app.py, reached through the same
+ASGI entry point; both share the session cookie (same secret key).
+
+    hypercorn async_app:application --bind 0.0.0.0:5000
+
+Requires `quart` and `hypercorn` on top of the normal dependencies.
+"""
+import asyncio
+import os
+
+from quart import Quart, jsonify, redirect, render_template, request, session # type: ignore
+from hypercorn.middleware import AsyncioWSGIMiddleware # type: ignore
+
+import app as sync_app
+from app import (levels, question_bank, achievement_catalog, progress_cache, profile_cache,
+                 on_attempts_committed)
+from profile_cache import SUMMARY_QUERIES, ALL_ACHIEVEMENTS_QUERY, build_summary
+from attempt_writer import write_attempts_async
+from db_aio import AsyncConnectionPool
+
+quart_app = Quart(__name__)
+quart_app.secret_key = sync_app.app.secret_key
+
+db_pool = AsyncConnectionPool(
+    sync_app.config,
+    size=int(os.environ.get("MAZE_AIO_POOL_SIZE", 50)),
+    timeout=float(os.environ.get("MAZE_DB_POOL_TIMEOUT", 5)),
+)
+refresh_task = None
+
+
+async def refresh_question_bank():
+    # The only refresher in async mode (auto_refresh is off), run in a
+    # thread so handlers on the event loop only ever read memory
+    while True:
+        await asyncio.to_thread(question_bank.refresh)
+        await asyncio.sleep(question_bank.check_interval)
+
+
+@quart_app.before_serving
+async def startup():
+    global refresh_task
+    await asyncio.to_thread(achievement_catalog.ids)
+    question_bank.auto_refresh = False
+    await asyncio.to_thread(question_bank.refresh)
+    refresh_task = asyncio.ensure_future(refresh_question_bank())
+
+
+@quart_app.after_serving
+async def shutdown():
+    if refresh_task is not None:
+        refresh_task.cancel()
+    await db_pool.close()
+
+
+@quart_app.route('/get_question')
+async def get_question():
+    body, status = sync_app.question_result(session)
+    return jsonify(body), status
+
+
+@quart_app.route('/get_questions')
+async def get_questions():
+    body, status = sync_app.questions_result(session, request.args.get('n', 5, type=int))
+    return jsonify(body), status
+
+
+@quart_app.route('/validate_answer', methods=['POST'])
+async def validate_answer():
+    body, status = sync_app.answer_result(await request.get_json() or {})
+    return jsonify(body), status
+
+
+@quart_app.route('/validate_answers', methods=['POST'])
+async def validate_answers():
+    body, status = sync_app.answers_result(await request.get_json() or {})
+    return jsonify(body), status
+
+
+@quart_app.route('/get_unlocked_levels')
+async def get_unlocked_levels():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    max_unlocked = progress_cache.peek(user_id, session.get('progress_version', 0))
+    if max_unlocked is None:
+        async with db_pool.cursor() as (conn, cursor):
+            await cursor.execute("SELECT max_level_unlocked FROM users WHERE id = %s", (user_id,))
+            result = await cursor.fetchone()
+        max_unlocked = result[0] if result else 1
+        progress_cache.put(user_id, max_unlocked)
+
+    return jsonify({
+        'unlocked_levels': max_unlocked,
+        'total_levels': len(levels)
+    })
+
+
+@quart_app.route('/submit_score', methods=['POST'])
+async def submit_score():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    data = await request.get_json() or {}
+    level = session.get('current_level', 1)
+    fields = sync_app.score_fields(data, level)
+    if fields is None:
+        return jsonify({'error': 'Invalid score, walls_broken or time_left'}), 400
+    score = fields['score']
+    event = dict(fields, user_id=session['user_id'], level=level,
+                 run=sync_app.run_log(data, session.pop('maze', None)))
+
+    if sync_app.attempt_writer is not None and sync_app.attempt_writer.submit(event):
+        session['profile_version'] = session.get('profile_version', 0) + 1
+        return jsonify({'message': 'Score queued', 'score': score}), 202
+
+    async with db_pool.cursor() as (conn, cursor):
+        try:
+            await write_attempts_async(cursor, [event], achievement_catalog)
+            await conn.commit()
+        except Exception as e:
+            await conn.rollback()
+            print("🔥 submit_score ERROR:", e)
+            return jsonify({'error': str(e)}), 500
+    on_attempts_committed([event])
+    session['profile_version'] = session.get('profile_version', 0) + 1
+
+    return jsonify({'message': 'Score submitted and recorded', 'score': score})
+
+
+async def fetch(query, params=(), one=False):
+    async with db_pool.cursor(dictionary=True) as (conn, cursor):
+        await cursor.execute(query, params)
+        return await (cursor.fetchone() if one else cursor.fetchall())
+
+
+@quart_app.route('/profile')
+async def profile():
+    if 'user_id' not in session:
+        return redirect('/login')
+
+    user_id = session['user_id']
+    summary = profile_cache.peek(user_id, session.get('profile_version', 0))
+    if summary is None:
+        # The summary reads are independent, so run them on separate connections at once
+        user, user_achievements, all_achievements = await asyncio.gather(
+            fetch(SUMMARY_QUERIES['user'], (user_id,), one=True),
+            fetch(SUMMARY_QUERIES['user_achievements'], (user_id,)),
+            fetch(ALL_ACHIEVEMENTS_QUERY),
+        )
+        summary = build_summary(user, user_achievements, all_achievements)
+        if summary is None:
+            return redirect('/login')
+        profile_cache.put(user_id, summary)
+    session['profile_version'] = max(session.get('profile_version', 0), summary['stats']['attempts_count'])
+
+    # Attempt history is paged in by the page itself from /profile/attempts
+    return await render_template('profile.html', **summary)
+
+
+@quart_app.route('/aio_pool_stats')
+async def aio_pool_stats():
+    if not sync_app.ops_allowed(request.headers.get('Authorization'), request.remote_addr):
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(db_pool.stats())
+
+
+ASYNC_PATHS = {rule.rule for rule in quart_app.url_map.iter_rules() if rule.endpoint != 'static'}
+flask_asgi = AsyncioWSGIMiddleware(sync_app.app)
+
+
+async def application(scope, receive, send):
+    # Lifespan events and the async routes go to Quart, the rest to Flask
+    if scope["type"] == "lifespan" or scope.get("path") in ASYNC_PATHS:
+        await quart_app(scope, receive, send)
+    else:
+        await flask_asgi(scope, receive, send)
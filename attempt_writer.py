@@ -0,0 +1,320 @@
+import queue
+import threading
+import time
+
+from mysql.connector import DataError, IntegrityError # type: ignore
+
+from achievements import earned_ids
+
+
+INSERT_ATTEMPTS_SQL = """
+    INSERT INTO attempts (user_id, level, score, walls_broken, time_left)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+UPSERT_SCORES_SQL = """
+    INSERT INTO scores (user_id, level, score)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE score = GREATEST(score, VALUES(score))
+"""
+
+UPSERT_STATS_SQL = """
+    INSERT INTO user_stats (user_id, attempts_count, total_score, total_walls_broken)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        attempts_count = attempts_count + VALUES(attempts_count),
+        total_score = total_score + VALUES(total_score),
+        total_walls_broken = total_walls_broken + VALUES(total_walls_broken)
+"""
+
+INSERT_AWARDS_SQL = """
+    INSERT IGNORE INTO user_achievements (user_id, achievement_id)
+    VALUES (%s, %s)
+"""
+
+# The rows themselves were refused; retrying the same batch can't help
+ROW_ERRORS = (DataError, IntegrityError)
+
+INSERT_RUN_LOGS_SQL = """
+    INSERT INTO run_logs (user_id, level, score, walls_broken, time_left,
+                          maze_cols, maze_rows, maze_seed, maze_algorithm, moves, move_count)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def select_stats_sql(user_ids):
+    return ("SELECT user_id, attempts_count, total_score, total_walls_broken FROM user_stats "
+            "WHERE user_id IN (%s) FOR UPDATE" % ", ".join(["%s"] * len(user_ids)))
+
+
+def attempt_rows(events):
+    return [(e['user_id'], e['level'], e['score'], e['walls_broken'], e['time_left']) for e in events]
+
+
+def run_log_rows(events):
+    # Move logs for verifier.py; `maze` is what /get_maze served, if anything
+    rows = []
+    for e in events:
+        run = e.get('run')
+        if run is None:
+            continue
+        maze = run.get('maze') or {}
+        rows.append((e['user_id'], e['level'], e['score'], e['walls_broken'], e['time_left'],
+                     maze.get('cols'), maze.get('rows'), maze.get('seed'), maze.get('algorithm'),
+                     run['moves'], run['move_count']))
+    return rows
+
+
+def best_score_rows(events):
+    # Best score per (user, level), coalesced so each key is upserted once
+    best = {}
+    for e in events:
+        key = (e['user_id'], e['level'])
+        best[key] = max(best.get(key, e['score']), e['score'])
+    return [(user_id, level, score) for (user_id, level), score in best.items()]
+
+
+def tally(events, stats_rows, achievement_ids):
+    """Walk the runs in order on top of the current user_stats rows, so each
+    one is judged against the stats it would have seen if written on its own.
+    Returns (user_stats increment rows, user_achievements rows).
+    """
+    totals = {row[0]: {'attempts_count': row[1], 'total_score': row[2], 'total_walls_broken': row[3]}
+              for row in stats_rows}
+    deltas = {}
+    awards = set()
+    for e in events:
+        stats = totals.setdefault(e['user_id'], {'attempts_count': 0, 'total_score': 0, 'total_walls_broken': 0})
+        delta = deltas.setdefault(e['user_id'], [0, 0, 0])
+        stats['attempts_count'] += 1
+        stats['total_score'] += e['score']
+        stats['total_walls_broken'] += e['walls_broken']
+        delta[0] += 1
+        delta[1] += e['score']
+        delta[2] += e['walls_broken']
+        for ach_id in earned_ids(achievement_ids, e, stats):
+            awards.add((e['user_id'], ach_id))
+    return [(user_id, d[0], d[1], d[2]) for user_id, d in deltas.items()], sorted(awards)
+
+
+def write_attempts(cursor, events, catalog):
+    """Record a batch of finished runs. The caller owns the transaction.
+
+    Used directly by submit_score (a batch of one) and by AttemptWriter's
+    flusher, so both modes write exactly the same rows.
+    """
+    cursor.executemany(INSERT_ATTEMPTS_SQL, attempt_rows(events))
+    cursor.executemany(UPSERT_SCORES_SQL, best_score_rows(events))
+
+    user_ids = sorted({e['user_id'] for e in events})
+    cursor.execute(select_stats_sql(user_ids), tuple(user_ids))
+    stats_rows, award_rows = tally(events, cursor.fetchall(), catalog.ids(cursor))
+
+    cursor.executemany(UPSERT_STATS_SQL, stats_rows)
+    if award_rows:
+        cursor.executemany(INSERT_AWARDS_SQL, award_rows)
+    run_rows = run_log_rows(events)
+    if run_rows:
+        cursor.executemany(INSERT_RUN_LOGS_SQL, run_rows)
+
+
+async def write_attempts_async(cursor, events, catalog):
+    # Same as write_attempts() for a mysql.connector.aio cursor. The
+    # achievement ids must already be loaded (catalog.ids() at startup).
+    await cursor.executemany(INSERT_ATTEMPTS_SQL, attempt_rows(events))
+    await cursor.executemany(UPSERT_SCORES_SQL, best_score_rows(events))
+
+    user_ids = sorted({e['user_id'] for e in events})
+    await cursor.execute(select_stats_sql(user_ids), tuple(user_ids))
+    stats_rows, award_rows = tally(events, await cursor.fetchall(), catalog.ids())
+
+    await cursor.executemany(UPSERT_STATS_SQL, stats_rows)
+    if award_rows:
+        await cursor.executemany(INSERT_AWARDS_SQL, award_rows)
+    run_rows = run_log_rows(events)
+    if run_rows:
+        await cursor.executemany(INSERT_RUN_LOGS_SQL, run_rows)
+
+
+class AttemptWriter:
+    """Write-behind queue for submit_score.
+
+    Runs are queued in memory and a background thread writes them with
+    write_attempts() once `batch_size` are waiting or `flush_interval`
+    seconds have passed. If the rows themselves were refused
+    (DataError/IntegrityError) the batch is split in halves until the bad
+    runs are isolated, so only those are dropped. Any other failure (server
+    gone, pool exhausted) keeps the batch and retries it with backoff capped
+    at `max_backoff` seconds; meanwhile a full queue makes submit() return
+    False, so new runs are written inline. `on_commit`, if given, is called
+    with each batch once it has been committed.
+    """
+
+    def __init__(self, pool, catalog, max_queue=10000, batch_size=500, flush_interval=1.0, max_backoff=30.0,
+                 on_commit=None):
+        self.pool = pool
+        self.catalog = catalog
+        self.on_commit = on_commit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._retry = []
+        self._retries = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "rejected": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "failures": 0,
+            "last_batch_size": 0,
+            "last_flush_seconds": 0.0,
+            "last_flush_lag": 0.0,
+            "last_flush_at": None,
+        }
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="attempt-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10.0):
+        # Drain whatever is still queued, then let the thread exit
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, event):
+        # Returns False when the queue is full or the writer is stopping, so
+        # the caller can write inline
+        if self._stop.is_set():
+            self._bump("rejected")
+            return False
+        event = dict(event, queued_at=time.monotonic())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._bump("rejected")
+            return False
+        self._bump("queued")
+        return True
+
+    def _bump(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _collect(self):
+        batch = self._retry
+        self._retry = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if self._stop.is_set() or timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        with self.pool.cursor() as (conn, cursor):
+            try:
+                write_attempts(cursor, batch, self.catalog)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _flush(self, batch):
+        started = time.monotonic()
+        try:
+            self._write(batch)
+        except ROW_ERRORS as e:
+            self._bump("failures")
+            print("🔥 attempt writer flush failed, isolating bad runs:", e)
+            unwritten = self._isolate(batch)
+            if unwritten:
+                self._retry_later(unwritten, "connection lost while isolating bad runs")
+            else:
+                self._retries = 0
+            return
+        except Exception as e:
+            self._bump("failures")
+            self._retry_later(batch, e)
+            return
+
+        self._retries = 0
+        self._committed(batch, started)
+
+    def _retry_later(self, batch, error):
+        # Keep every run and back off; the database is down, not the data bad
+        self._retries += 1
+        delay = min(self.flush_interval * 2 ** (self._retries - 1), self.max_backoff)
+        print("🔥 attempt writer flush failed, retrying in %.1fs:" % delay, error)
+        self._retry = batch
+        if self._stop.is_set():
+            time.sleep(delay)  # still draining for stop(); don't spin
+        else:
+            self._stop.wait(delay)
+
+    def _isolate(self, batch):
+        # `batch` was refused as a whole. Bisect until the bad runs are
+        # alone, writing every half that goes through. Returns the runs left
+        # unwritten if the connection fails part way, for a later retry.
+        if len(batch) == 1:
+            print("🔥 attempt writer dropped run:", batch[0])
+            self._bump("dropped")
+            return []
+        middle = len(batch) // 2
+        halves = [batch[:middle], batch[middle:]]
+        for i, half in enumerate(halves):
+            started = time.monotonic()
+            try:
+                self._write(half)
+            except ROW_ERRORS:
+                unwritten = self._isolate(half)
+            except Exception:
+                unwritten = half
+            else:
+                self._committed(half, started)
+                continue
+            if unwritten:
+                return unwritten + [e for rest in halves[i + 1:] for e in rest]
+        return []
+
+    def _committed(self, batch, started):
+        if self.on_commit is not None:
+            try:
+                self.on_commit(batch)
+            except Exception as e:
+                print("🔥 attempt writer on_commit failed:", e)
+        finished = time.monotonic()
+        with self._stats_lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_flush_seconds"] = finished - started
+            self._stats["last_flush_lag"] = finished - min(e['queued_at'] for e in batch)
+            self._stats["last_flush_at"] = time.time()
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+            elif self._stop.is_set():
+                break
+
+    def stats(self):
+        with self._stats_lock:
+            data = dict(self._stats)
+        data["depth"] = self._queue.qsize() + len(self._retry)
+        data["running"] = self._thread is not None and self._thread.is_alive()
+        return data
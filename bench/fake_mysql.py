@@ -0,0 +1,218 @@
+"""In-process stand-in for MySQL, used by the load test.
+
+Exposes just enough of mysql.connector's pooled-connection interface for
+db.ConnectionPool: get_connection() returns a connection with cursor(),
+commit(), rollback(), close(), is_connected() and reconnect(). Statements
+run against a shared in-memory SQLite database after a light MySQL ->
+SQLite rewrite. Transactions are serialised with one lock, and an optional
+per-statement delay stands in for the network round trip.
+"""
+import re
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    max_level_unlocked INTEGER DEFAULT 1
+);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL,
+    option_a TEXT, option_b TEXT, option_c TEXT, option_d TEXT,
+    correct_option TEXT NOT NULL,
+    difficulty TEXT NOT NULL DEFAULT 'easy'
+);
+CREATE TABLE attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    walls_broken INTEGER NOT NULL,
+    time_left INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_attempts_user_created ON attempts (user_id, created_at, id);
+CREATE TABLE scores (
+    user_id INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    UNIQUE (user_id, level)
+);
+CREATE TABLE achievements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code TEXT NOT NULL UNIQUE,
+    title TEXT,
+    description TEXT
+);
+CREATE TABLE user_achievements (
+    user_id INTEGER NOT NULL,
+    achievement_id INTEGER NOT NULL,
+    awarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, achievement_id)
+);
+CREATE TABLE user_stats (
+    user_id INTEGER PRIMARY KEY,
+    attempts_count INTEGER NOT NULL DEFAULT 0,
+    total_score INTEGER NOT NULL DEFAULT 0,
+    total_walls_broken INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE run_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    walls_broken INTEGER NOT NULL,
+    time_left INTEGER NOT NULL,
+    maze_cols INTEGER,
+    maze_rows INTEGER,
+    maze_seed INTEGER,
+    maze_algorithm TEXT,
+    moves TEXT NOT NULL,
+    move_count INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status TEXT NOT NULL DEFAULT 'pending',
+    reason TEXT,
+    optimal_moves INTEGER,
+    verified_at TIMESTAMP
+);
+CREATE INDEX idx_run_logs_status ON run_logs (status, id);
+"""
+
+ACHIEVEMENTS = [
+    ('FIRST_WIN', 'First Win', 'Complete your first maze'),
+    ('NO_WALL_BREAK', 'Pathfinder', 'Finish without breaking a wall'),
+    ('FAST_FINISH', 'Speedrunner', 'Finish with 30 seconds or more left'),
+    ('WALL_BREAKER', 'Wall Breaker', 'Break 10 walls in total'),
+]
+
+_VALUES_REF = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+
+
+def translate(statement):
+    sql = statement.replace("%s", "?")
+    sql = re.sub(r"INSERT\s+IGNORE", "INSERT OR IGNORE", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bGREATEST\(", "MAX(", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bRAND\(\)", "RANDOM()", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bNOW\(\)", "CURRENT_TIMESTAMP", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\s+FOR\s+UPDATE\b", "", sql, flags=re.IGNORECASE)
+    match = re.search(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", sql, flags=re.IGNORECASE)
+    if match:
+        update = _VALUES_REF.sub(r"excluded.\1", sql[match.end():])
+        sql = sql[:match.start()] + "ON CONFLICT DO UPDATE SET" + update
+    return sql
+
+
+class FakeCursor:
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def _run(self, method, statement, params):
+        self._connection._begin()
+        self._cursor = self._connection._db._conn.cursor()
+        getattr(self._cursor, method)(translate(statement), params)
+
+    def execute(self, statement, params=(), *args, **kwargs):
+        self._run("execute", statement, tuple(params or ()))
+
+    def executemany(self, statement, seq_params, *args, **kwargs):
+        self._run("executemany", statement, [tuple(p) for p in seq_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([d[0] for d in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self._db = db
+        self._holding = False
+
+    def _begin(self):
+        if self._db.latency:
+            time.sleep(self._db.latency)
+        if not self._holding:
+            self._db._lock.acquire()
+            self._holding = True
+
+    def _end(self):
+        if self._holding:
+            self._holding = False
+            self._db._lock.release()
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self, dictionary)
+
+    def commit(self):
+        if self._holding:
+            self._db._conn.commit()
+        self._end()
+
+    def rollback(self):
+        if self._holding:
+            self._db._conn.rollback()
+        self._end()
+
+    def is_connected(self):
+        return True
+
+    def reconnect(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        # Like pool_reset_session: anything uncommitted is discarded
+        self.rollback()
+
+
+class FakeMySQL:
+    """Drop-in for mysql.connector's MySQLConnectionPool."""
+
+    def __init__(self, latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES)
+        self._conn.executescript(SCHEMA)
+        self._conn.executemany("INSERT INTO achievements (code, title, description) VALUES (?, ?, ?)",
+                               ACHIEVEMENTS)
+        self._conn.commit()
+
+    def seed_questions(self, per_difficulty):
+        rows = []
+        for difficulty in ('easy', 'medium', 'hard', 'extreme'):
+            for i in range(per_difficulty):
+                rows.append(("%s question %d?" % (difficulty, i), 'a', 'b', 'c', 'd', 'ABCD'[i % 4], difficulty))
+        self._conn.executemany("""
+            INSERT INTO questions (question, option_a, option_b, option_c, option_d, correct_option, difficulty)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        self._conn.commit()
+
+    def get_connection(self):
+        return FakeConnection(self)
@@ -0,0 +1,63 @@
+"""Login throughput at different password-hash costs.
+
+Each method string is run through passwords.PasswordHasher exactly as
+/login uses it: one stored hash, `--logins` concurrent verify() calls.
+
+    python bench/hash_bench.py
+    python bench/hash_bench.py --workers 8 --processes scrypt:16384:8:1 pbkdf2:sha256:600000
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passwords import PasswordHasher # noqa: E402
+
+DEFAULT_METHODS = [
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:300000",
+    "pbkdf2:sha256:600000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+    "scrypt:65536:8:1",
+]
+
+
+def run(method, args):
+    hasher = PasswordHasher(method=method, workers=args.workers, max_pending=args.logins,
+                            timeout=300, use_processes=args.processes)
+    try:
+        stored = hasher.hash("correct horse battery staple")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            results = list(clients.map(lambda _: hasher.verify(stored, "correct horse battery staple"),
+                                       range(args.logins)))
+        elapsed = time.perf_counter() - started
+    finally:
+        hasher.shutdown()
+    assert all(results)
+    return args.logins / elapsed, 1000 * elapsed / args.logins * args.workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password hashing cost vs. login throughput")
+    parser.add_argument("methods", nargs="*", default=DEFAULT_METHODS)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent login requests")
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    args = parser.parse_args(argv)
+
+    print("%d workers (%s), %d logins per method" % (
+        args.workers, "processes" if args.processes else "threads", args.logins))
+    print("%-24s %12s %14s" % ("method", "logins/sec", "ms per hash"))
+    for method in args.methods:
+        rate, per_hash = run(method, args)
+        print("%-24s %12.1f %14.1f" % (method, rate, per_hash))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Load test: N concurrent simulated players against the real Flask app.
+
+Each player registers, logs in, then plays through the levels:
+select_level -> get_maze -> get_questions/get_question/validate_answer
+per wall hit -> submit_score -> next_level, and finally opens /profile
+and the first page of its attempt history.
+The database is bench/fake_mysql.py, swapped in underneath db_pool, so
+the pool, caches and metrics all run exactly as in production.
+
+    python bench/loadtest.py --players 50 --walls 20
+    python bench/loadtest.py --save bench/baseline.json
+    python bench/loadtest.py --compare bench/baseline.json
+
+Any response with status >= 400 counts as an error; a run with errors exits
+1 and is never saved, so a baseline can't hide a failing route.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_mysql import FakeMySQL # noqa: E402
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = {}
+        self.errors = {}
+
+    def call(self, route, fn, *args, **kwargs):
+        started = time.perf_counter()
+        response = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.timings.setdefault(route, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+        return response
+
+
+def play(app_module, recorder, run_id, player_id, args):
+    rng = random.Random(args.seed * 100003 + player_id)
+    client = app_module.app.test_client()
+    username = "bench_%s_%d" % (run_id, player_id)
+    password = "pw-%d" % player_id
+
+    recorder.call("register", client.post, "/register", data={'username': username, 'password': password})
+    recorder.call("login", client.post, "/login", data={'username': username, 'password': password})
+
+    for level in range(1, args.levels + 1):
+        recorder.call("select_level", client.get, "/select_level/%d" % level)
+        recorder.call("get_unlocked_levels", client.get, "/get_unlocked_levels")
+        recorder.call("get_maze", client.get, "/get_maze")
+
+        queue = []
+        walls_broken = 0
+        for _ in range(args.walls):
+            if not queue:
+                batch = recorder.call("get_questions", client.get, "/get_questions?n=5").get_json() or {}
+                queue = batch.get('questions', [])
+            if queue:
+                question = queue.pop()
+            else:
+                question = recorder.call("get_question", client.get, "/get_question").get_json()
+            answer = rng.choice("ABCD")
+            result = recorder.call("validate_answer", client.post, "/validate_answer",
+                                   json={'id': question['id'], 'answer': answer}).get_json()
+            if result and result.get('correct'):
+                walls_broken += 1
+
+        # The client stops breaking walls at the level's limit
+        config = app_module.levels[level]
+        walls_broken = min(walls_broken, config['wall_break_limit'])
+        time_left = rng.randint(0, config['time_limit'])
+        recorder.call("submit_score", client.post, "/submit_score",
+                      json={'score': time_left * 10, 'walls_broken': walls_broken, 'time_left': time_left})
+        recorder.call("next_level", client.post, "/next_level")
+
+    recorder.call("leaderboard", client.get, "/leaderboard")
+    recorder.call("profile", client.get, "/profile")
+    recorder.call("profile_attempts", client.get, "/profile/attempts?limit=20")
+
+
+def summarise(recorder, wall_seconds, args):
+    routes = {}
+    total = 0
+    for route, values in sorted(recorder.timings.items()):
+        values.sort()
+        total += len(values)
+        routes[route] = {
+            'count': len(values),
+            'errors': recorder.errors.get(route, 0),
+            'mean_ms': 1000 * sum(values) / len(values),
+            'p50_ms': 1000 * percentile(values, 50),
+            'p95_ms': 1000 * percentile(values, 95),
+            'p99_ms': 1000 * percentile(values, 99),
+        }
+    return {
+        'config': {k: getattr(args, k) for k in ('players', 'concurrency', 'levels', 'walls', 'db_latency_ms', 'seed')},
+        'wall_seconds': wall_seconds,
+        'requests': total,
+        'throughput_rps': total / wall_seconds if wall_seconds else 0.0,
+        'routes': routes,
+    }
+
+
+def print_report(report, baseline=None):
+    print("%d requests in %.2fs -> %.1f req/s" % (report['requests'], report['wall_seconds'], report['throughput_rps']))
+    if baseline:
+        print("baseline throughput: %.1f req/s (%+.1f%%)" % (
+            baseline['throughput_rps'],
+            100.0 * (report['throughput_rps'] / baseline['throughput_rps'] - 1) if baseline['throughput_rps'] else 0.0))
+    print("%-20s %7s %6s %9s %9s %9s %9s" % ("route", "count", "errs", "mean ms", "p50 ms", "p95 ms", "p99 ms"))
+    for route, row in report['routes'].items():
+        line = "%-20s %7d %6d %9.2f %9.2f %9.2f %9.2f" % (
+            route, row['count'], row['errors'], row['mean_ms'], row['p50_ms'], row['p95_ms'], row['p99_ms'])
+        old = (baseline or {}).get('routes', {}).get(route)
+        if old and old['p95_ms']:
+            line += "   p95 %+.0f%%" % (100.0 * (row['p95_ms'] / old['p95_ms'] - 1))
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-player load test for app.py")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--walls", type=int, default=15, help="wall hits (questions) per level")
+    parser.add_argument("--questions", type=int, default=200, help="questions per difficulty in the fake DB")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated round trip per statement")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the JSON report here (e.g. a new baseline)")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    import app as app_module
+
+    fake = FakeMySQL(latency_ms=args.db_latency_ms)
+    fake.seed_questions(args.questions)
+    app_module.db_pool._pool = fake
+    app_module.db_pool.size = args.concurrency
+    app_module.db_pool._slots = threading.BoundedSemaphore(args.concurrency)
+
+    recorder = Recorder()
+    run_id = "%d_%d" % (os.getpid(), int(time.time()))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(play, app_module, recorder, run_id, i, args) for i in range(args.players)]
+        for future in futures:
+            future.result()
+    wall_seconds = time.perf_counter() - started
+
+    if app_module.attempt_writer is not None:
+        app_module.attempt_writer.stop()
+
+    report = summarise(recorder, wall_seconds, args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    failing = sorted(route for route, row in report['routes'].items() if row['errors'])
+    if failing:
+        print("❌ errors on: %s%s" % (", ".join(failing), "; not saved" if args.save else ""), file=sys.stderr)
+        return 1
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
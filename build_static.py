@@ -0,0 +1,65 @@
+"""Fingerprint and precompress everything in static/.
+
+    python build_static.py
+
+Each file is copied to static/dist/ as <name>.<hash>.<ext>, plus a .gz
+twin, and static/dist/manifest.json maps the original name to the copy.
+When the manifest exists, static_assets.StaticAssets rewrites
+url_for('static', ...) to the fingerprinted copy and serves it with an
+immutable Cache-Control. Rerun after changing anything in static/.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST = "dist"
+MANIFEST = "manifest.json"
+HASH_LENGTH = 12
+
+
+def source_files(static_dir):
+    for root, dirs, files in os.walk(static_dir):
+        if root == static_dir:
+            dirs[:] = [d for d in dirs if d != DIST]
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/")
+
+
+def fingerprinted_name(filename, digest):
+    stem, ext = os.path.splitext(filename)
+    return "%s.%s%s" % (stem, digest[:HASH_LENGTH], ext)
+
+
+def build(static_dir=STATIC_DIR):
+    dist_dir = os.path.join(static_dir, DIST)
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    for filename in source_files(static_dir):
+        with open(os.path.join(static_dir, filename), "rb") as f:
+            data = f.read()
+        target = fingerprinted_name(filename, hashlib.sha256(data).hexdigest())
+        path = os.path.join(dist_dir, target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        # mtime=0 so the same input always produces the same .gz
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        with open(path + ".gz", "wb") as f:
+            f.write(compressed)
+        manifest[filename] = DIST + "/" + target
+        print("%-20s -> %s (%d -> %d bytes gzipped)" % (filename, target, len(data), len(compressed)))
+
+    with open(os.path.join(dist_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+if __name__ == "__main__":
+    build()
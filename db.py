@@ -0,0 +1,140 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from mysql.connector import pooling # type: ignore
+from mysql.connector import Error # type: ignore
+
+
+class PoolExhausted(Error):
+    pass
+
+
+class TimedCursor:
+    """Cursor proxy that reports each execute()/executemany() to an observer."""
+
+    def __init__(self, cursor, observer):
+        self._cursor = cursor
+        self._observer = observer
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._observer(operation, time.perf_counter() - started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._observer(operation, time.perf_counter() - started)
+
+
+class ConnectionPool:
+    """Thread-safe wrapper around mysql.connector's pool.
+
+    The stock MySQLConnectionPool raises as soon as it runs dry, so checkouts
+    are gated by a semaphore that lets requests wait up to `timeout` seconds
+    for a connection before giving up. If `observer` is set, cursors handed
+    out by cursor() report every statement and its duration to it.
+    """
+
+    def __init__(self, config, size=5, name="maze_pool", timeout=5.0, observer=None):
+        self.config = dict(config)
+        self.observer = observer
+        self.size = size
+        self.name = name
+        self.timeout = timeout
+        self._pool = None
+        self._init_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "exhausted": 0,
+            "in_use": 0,
+            "checkout_time_total": 0.0,
+            "checkout_time_max": 0.0,
+        }
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._init_lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name=self.name,
+                        pool_size=self.size,
+                        pool_reset_session=True,
+                        **self.config
+                    )
+        return self._pool
+
+    def _bump(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _checkout(self):
+        started = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            self._bump("waits")
+            if not self._slots.acquire(timeout=self.timeout):
+                self._bump("exhausted")
+                raise PoolExhausted("No free connection in pool '%s' after %.1fs" % (self.name, self.timeout))
+
+        try:
+            # get_connection() already pings and reconnects a connection that
+            # went away while idle, and keeps it in the pool if that fails
+            conn = self._get_pool().get_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["checkout_time_total"] += elapsed
+            self._stats["checkout_time_max"] = max(self._stats["checkout_time_max"], elapsed)
+        return conn
+
+    def _release(self, conn):
+        try:
+            conn.close()  # returns the connection to the underlying pool
+        finally:
+            self._bump("in_use", -1)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=dictionary)
+            if self.observer is not None:
+                cursor = TimedCursor(cursor, self.observer)
+            try:
+                yield conn, cursor
+            finally:
+                cursor.close()
+
+    def stats(self):
+        with self._stats_lock:
+            data = dict(self._stats)
+        data["size"] = self.size
+        data["checkout_time_avg"] = data["checkout_time_total"] / data["checkouts"] if data["checkouts"] else 0.0
+        return data
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from mysql.connector import aio # type: ignore
+
+from db import PoolExhausted
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of db.ConnectionPool on mysql.connector.aio.
+
+    Idle connections sit in an asyncio.Queue; a semaphore caps how many are
+    open at once, and a checkout waits up to `timeout` seconds for one.
+    Connections are opened lazily and health-checked on checkout. Must be
+    used from a single event loop.
+    """
+
+    def __init__(self, config, size=20, timeout=5.0):
+        self.config = dict(config)
+        self.size = size
+        self.timeout = timeout
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "exhausted": 0,
+            "reconnects": 0,
+            "opened": 0,
+            "in_use": 0,
+            "checkout_time_total": 0.0,
+            "checkout_time_max": 0.0,
+        }
+
+    async def _checkout(self):
+        started = time.perf_counter()
+        if self._slots.locked():
+            self._stats["waits"] += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["exhausted"] += 1
+            raise PoolExhausted("No free connection in async pool after %.1fs" % self.timeout)
+
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                conn = await aio.connect(**self.config)
+                self._stats["opened"] += 1
+            else:
+                if not await conn.is_connected():
+                    await conn.reconnect(attempts=2, delay=0)
+                    self._stats["reconnects"] += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        elapsed = time.perf_counter() - started
+        self._stats["checkouts"] += 1
+        self._stats["in_use"] += 1
+        self._stats["checkout_time_total"] += elapsed
+        self._stats["checkout_time_max"] = max(self._stats["checkout_time_max"], elapsed)
+        return conn
+
+    async def _release(self, conn):
+        try:
+            # Drop anything left uncommitted before the next checkout
+            await conn.rollback()
+            self._idle.put_nowait(conn)
+        except Exception:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+        finally:
+            self._stats["in_use"] -= 1
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self._checkout()
+        try:
+            yield conn
+        finally:
+            await self._release(conn)
+
+    @asynccontextmanager
+    async def cursor(self, dictionary=False):
+        async with self.connection() as conn:
+            cursor = await conn.cursor(dictionary=dictionary)
+            try:
+                yield conn, cursor
+            finally:
+                await cursor.close()
+
+    async def close(self):
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+
+    def stats(self):
+        data = dict(self._stats)
+        data["size"] = self.size
+        data["checkout_time_avg"] = data["checkout_time_total"] / data["checkouts"] if data["checkouts"] else 0.0
+        return data
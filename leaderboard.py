@@ -0,0 +1,144 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+
+class Board:
+    """One ranking: user_id -> score plus a sorted list of (-score, user_id).
+
+    Rank and page lookups are binary searches over the sorted list; an
+    update is a bisect plus a list insert/delete (a memmove, no rescans).
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._scores = {}
+
+    @classmethod
+    def from_scores(cls, scores):
+        # Bulk load with one sort instead of an insort per row
+        board = cls()
+        board._scores = dict(scores)
+        board._keys = sorted((-score, user_id) for user_id, score in board._scores.items())
+        return board
+
+    def __len__(self):
+        return len(self._keys)
+
+    def score(self, user_id):
+        return self._scores.get(user_id)
+
+    def set(self, user_id, score):
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, (-score, user_id))
+
+    def rank(self, user_id):
+        # Competition ranking: ties share a rank (1, 2, 2, 4, ...)
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score,)) + 1
+
+    def page(self, offset, limit):
+        rows = []
+        for neg_score, user_id in self._keys[offset:offset + limit]:
+            rows.append({'rank': bisect_left(self._keys, (neg_score,)) + 1,
+                         'user_id': user_id,
+                         'score': -neg_score})
+        return rows
+
+
+class Leaderboard:
+    """Per-level best scores plus a global board (sum of per-level bests).
+
+    Seeded from `scores` and kept current by record() after every committed
+    submit. Each worker process holds its own copy, so it is re-seeded
+    every `ttl` seconds to pick up runs recorded by other workers; one
+    thread reseeds while the rest keep serving the current boards.
+    Usernames are fetched lazily for the rows actually shown.
+    """
+
+    def __init__(self, pool, ttl=300):
+        self.pool = pool
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+        self._levels = {}
+        self._global = Board()
+        self._usernames = {}
+        self._seeded_at = None
+
+    def seed(self):
+        with self.pool.cursor() as (conn, cursor):
+            cursor.execute("SELECT user_id, level, score FROM scores")
+            rows = cursor.fetchall()
+
+        per_level = {}
+        totals = {}
+        for user_id, level, score in rows:
+            per_level.setdefault(level, {})[user_id] = score
+            totals[user_id] = totals.get(user_id, 0) + score
+        levels = {level: Board.from_scores(scores) for level, scores in per_level.items()}
+        global_board = Board.from_scores(totals)
+
+        with self._lock:
+            self._levels, self._global = levels, global_board
+            self._seeded_at = time.monotonic()
+
+    def _ensure_seeded(self):
+        if self._seeded_at is not None and time.monotonic() - self._seeded_at < self.ttl:
+            return
+        # Only the first seed makes callers wait; a stale board keeps serving
+        if not self._seed_lock.acquire(blocking=self._seeded_at is None):
+            return
+        try:
+            if self._seeded_at is None or time.monotonic() - self._seeded_at >= self.ttl:
+                self.seed()
+        finally:
+            self._seed_lock.release()
+
+    def record(self, user_id, level, score):
+        with self._lock:
+            board = self._levels.setdefault(level, Board())
+            old = board.score(user_id)
+            if old is not None and old >= score:
+                return
+            board.set(user_id, score)
+            total = (self._global.score(user_id) or 0) + score - (old or 0)
+            self._global.set(user_id, total)
+
+    def _board(self, level):
+        if level is None:
+            return self._global
+        return self._levels.get(level, Board())
+
+    def _names(self, user_ids):
+        missing = [uid for uid in user_ids if uid not in self._usernames]
+        if missing:
+            with self.pool.cursor() as (conn, cursor):
+                cursor.execute("SELECT id, username FROM users WHERE id IN (%s)" % ", ".join(["%s"] * len(missing)),
+                               tuple(missing))
+                self._usernames.update(cursor.fetchall())
+        return self._usernames
+
+    def page(self, level=None, offset=0, limit=20):
+        self._ensure_seeded()
+        with self._lock:
+            board = self._board(level)
+            rows = board.page(offset, limit)
+            total = len(board)
+        names = self._names([row['user_id'] for row in rows])
+        for row in rows:
+            row['username'] = names.get(row['user_id'])
+        return rows, total
+
+    def rank(self, user_id, level=None):
+        self._ensure_seeded()
+        with self._lock:
+            board = self._board(level)
+            return board.rank(user_id), board.score(user_id)
@@ -0,0 +1,302 @@
+import base64
+from collections import deque
+
+import numpy as np # type: ignore
+
+# Wall bits, same order as Cell.walls in static/game.js: top, right, bottom, left
+N, E, S, W = 1, 2, 4, 8
+ALL_WALLS = N | E | S | W
+
+MAX_DIM = 1000
+
+
+def recursive_backtracker(cols, rows, rng):
+    # Iterative DFS over a flat bytearray; per-cell numpy indexing is far
+    # slower than bytearray access, so numpy is only used for the randoms.
+    n = cols * rows
+    walls = bytearray([ALL_WALLS]) * n
+    visited = bytearray(n)
+    rand = rng.random(n).tolist()
+    pick = 0
+
+    stack = [0]
+    visited[0] = 1
+    while stack:
+        cell = stack[-1]
+        x = cell % cols
+        options = []
+        if cell >= cols and not visited[cell - cols]:
+            options.append((cell - cols, N, S))
+        if x < cols - 1 and not visited[cell + 1]:
+            options.append((cell + 1, E, W))
+        if cell + cols < n and not visited[cell + cols]:
+            options.append((cell + cols, S, N))
+        if x > 0 and not visited[cell - 1]:
+            options.append((cell - 1, W, E))
+
+        if not options:
+            stack.pop()
+            continue
+
+        nxt, wall, opposite = options[int(rand[pick] * len(options))]
+        pick += 1
+        walls[cell] ^= wall
+        walls[nxt] ^= opposite
+        visited[nxt] = 1
+        stack.append(nxt)
+
+    return np.frombuffer(bytes(walls), dtype=np.uint8).reshape(rows, cols).copy()
+
+
+def _all_edges(cols, rows):
+    # Every interior edge as (cell_a, cell_b, is_horizontal), with cell_a < cell_b
+    idx = np.arange(cols * rows, dtype=np.int64).reshape(rows, cols)
+    east_a = idx[:, :-1].ravel()
+    south_a = idx[:-1, :].ravel()
+    a = np.concatenate((east_a, south_a))
+    b = np.concatenate((east_a + 1, south_a + cols))
+    horizontal = np.concatenate((np.ones(east_a.size, dtype=bool), np.zeros(south_a.size, dtype=bool)))
+    return a, b, horizontal
+
+
+def kruskal(cols, rows, rng):
+    n = cols * rows
+    a, b, horizontal = _all_edges(cols, rows)
+    order = rng.permutation(a.size)
+    a, b, horizontal = a[order], b[order], horizontal[order]
+
+    parent = list(range(n))
+    keep = bytearray(a.size)
+    remaining = n - 1
+    for i, (u, v) in enumerate(zip(a.tolist(), b.tolist())):
+        # find with path halving
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        if u != v:
+            parent[u] = v
+            keep[i] = 1
+            remaining -= 1
+            if not remaining:
+                break
+
+    mask = np.frombuffer(bytes(keep), dtype=bool)
+    return _walls_from_edges(cols, rows, a[mask], b[mask], horizontal[mask])
+
+
+def wilson(cols, rows, rng):
+    # Loop-erased random walks; produces a uniform spanning tree
+    n = cols * rows
+    in_tree = bytearray(n)
+    nxt = [0] * n
+    root = int(rng.integers(n))
+    in_tree[root] = 1
+
+    step_dirs = rng.integers(0, 4, size=4 * n).tolist()
+    si = 0
+
+    for start in rng.permutation(n).tolist():
+        if in_tree[start]:
+            continue
+        cell = start
+        while not in_tree[cell]:
+            if si == len(step_dirs):
+                step_dirs = rng.integers(0, 4, size=4 * n).tolist()
+                si = 0
+            d = step_dirs[si]
+            si += 1
+            x = cell % cols
+            if d == 0:
+                if cell < cols:
+                    continue
+                target = cell - cols
+            elif d == 1:
+                if x == cols - 1:
+                    continue
+                target = cell + 1
+            elif d == 2:
+                if cell + cols >= n:
+                    continue
+                target = cell + cols
+            else:
+                if x == 0:
+                    continue
+                target = cell - 1
+            # remembering only the last exit from each cell erases loops
+            nxt[cell] = target
+            cell = target
+
+        cell = start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            cell = nxt[cell]
+
+    # Every cell except the root now points at its parent in the tree
+    cells = np.arange(n, dtype=np.int64)
+    parents = np.array(nxt, dtype=np.int64)
+    cells, parents = cells[cells != root], parents[cells != root]
+    u, v = np.minimum(cells, parents), np.maximum(cells, parents)
+    return _walls_from_edges(cols, rows, u, v, (v - u) != cols)
+
+
+def sidewinder(cols, rows, rng):
+    # Fully vectorised: every row is independent, so the whole grid is carved
+    # with a handful of array operations. This is the one to use for very
+    # large grids (1000x1000 in a few milliseconds).
+    walls = np.full((rows, cols), ALL_WALLS, dtype=np.uint8)
+    walls[0, :-1] &= ~np.uint8(E)
+    walls[0, 1:] &= ~np.uint8(W)
+    if rows == 1:
+        return walls
+
+    close = rng.random((rows - 1, cols)) < 0.5
+    close[:, -1] = True
+    body = walls[1:]
+    body[:, :-1][~close[:, :-1]] &= ~np.uint8(E)
+    body[:, 1:][~close[:, :-1]] &= ~np.uint8(W)
+
+    flat_close = np.flatnonzero(close.ravel())
+    starts = np.concatenate(([0], flat_close[:-1] + 1))
+    lengths = flat_close - starts + 1
+    chosen = starts + (rng.random(starts.size) * lengths).astype(np.int64)
+    chosen += cols  # index into the full grid, skipping row 0
+
+    flat = walls.reshape(-1)
+    flat[chosen] &= ~np.uint8(N)
+    flat[chosen - cols] &= ~np.uint8(S)
+    return walls
+
+
+def _walls_from_edges(cols, rows, a, b, horizontal):
+    flat = np.full(cols * rows, ALL_WALLS, dtype=np.uint8)
+    h_a, h_b = a[horizontal], b[horizontal]
+    v_a, v_b = a[~horizontal], b[~horizontal]
+    # a < b always, so a horizontal edge opens E on a / W on b, vertical S / N
+    flat[h_a] &= ~np.uint8(E)
+    flat[h_b] &= ~np.uint8(W)
+    flat[v_a] &= ~np.uint8(S)
+    flat[v_b] &= ~np.uint8(N)
+    return flat.reshape(rows, cols)
+
+
+ALGORITHMS = {
+    "backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "sidewinder": sidewinder,
+}
+
+# What gameplay mazes are built with; verifier.py only accepts runs on these
+DEFAULT_ALGORITHM = "backtracker"
+
+
+def generate(cols, rows, seed=None, algorithm=DEFAULT_ALGORITHM):
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown maze algorithm: %s" % algorithm)
+    if not (1 <= cols <= MAX_DIM and 1 <= rows <= MAX_DIM):
+        raise ValueError("Maze size must be between 1 and %d" % MAX_DIM)
+    rng = np.random.default_rng(seed)
+    return ALGORITHMS[algorithm](cols, rows, rng)
+
+
+def pack(walls):
+    # Two cells per byte, row-major: even cell in the low nibble, odd in the high
+    flat = walls.reshape(-1).astype(np.uint8)
+    if flat.size % 2:
+        flat = np.append(flat, np.uint8(0))
+    return (flat[0::2] | (flat[1::2] << 4)).astype(np.uint8).tobytes()
+
+
+def unpack(data, cols, rows):
+    packed = np.frombuffer(data, dtype=np.uint8)
+    flat = np.empty(packed.size * 2, dtype=np.uint8)
+    flat[0::2] = packed & 0x0F
+    flat[1::2] = packed >> 4
+    return flat[:cols * rows].reshape(rows, cols)
+
+
+def encode(walls):
+    return base64.b64encode(pack(walls)).decode("ascii")
+
+
+def decode(text, cols, rows):
+    return unpack(base64.b64decode(text), cols, rows)
+
+
+# Moves are 2 bits each, in wall order (0=up, 1=right, 2=down, 3=left),
+# four per byte starting from the low bits, base64 encoded.
+MOVE_BITS = np.array([N, E, S, W], dtype=np.uint8)
+MOVE_DX = np.array([0, 1, 0, -1], dtype=np.int64)
+MOVE_DY = np.array([-1, 0, 1, 0], dtype=np.int64)
+
+
+def encode_moves(moves):
+    moves = np.asarray(moves, dtype=np.uint8)
+    padded = np.zeros(-(-moves.size // 4) * 4, dtype=np.uint8)
+    padded[:moves.size] = moves & 3
+    quads = padded.reshape(-1, 4)
+    packed = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+    return base64.b64encode(packed.astype(np.uint8).tobytes()).decode("ascii")
+
+
+def decode_moves(text, count):
+    packed = np.frombuffer(base64.b64decode(text), dtype=np.uint8)
+    if count > packed.size * 4:
+        raise ValueError("Move log is shorter than its move count")
+    moves = np.empty(packed.size * 4, dtype=np.uint8)
+    for shift in range(4):
+        moves[shift::4] = (packed >> (2 * shift)) & 3
+    return moves[:count]
+
+
+def replay(walls, moves):
+    """Replay a move log from the top-left cell against the generated maze.
+
+    Moving through a wall that exists in `walls` counts as breaking it;
+    a broken wall stays open, so crossing it again is free. Returns a dict
+    with `valid` (never left the grid), `walls_broken`, `reached_exit`
+    (ends on the bottom-right cell, and only gets there on the last move).
+    """
+    rows, cols = walls.shape
+    moves = np.asarray(moves, dtype=np.intp)
+    xs = np.concatenate(([0], np.cumsum(MOVE_DX[moves])))
+    ys = np.concatenate(([0], np.cumsum(MOVE_DY[moves])))
+    inside = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+    if not inside.all():
+        return {'valid': False, 'walls_broken': 0, 'reached_exit': False}
+
+    # Which steps went through a wall of the original maze
+    crossed = (walls[ys[:-1], xs[:-1]] & MOVE_BITS[moves]) != 0
+    before = ys[:-1] * cols + xs[:-1]
+    after = ys[1:] * cols + xs[1:]
+    edges = np.stack((np.minimum(before, after), np.maximum(before, after)), axis=1)[crossed]
+    walls_broken = len(np.unique(edges, axis=0)) if edges.size else 0
+
+    at_exit = np.flatnonzero((xs == cols - 1) & (ys == rows - 1))
+    reached_exit = at_exit.size > 0 and at_exit[0] == moves.size
+    return {'valid': True, 'walls_broken': walls_broken, 'reached_exit': bool(reached_exit)}
+
+
+def shortest_path_length(walls):
+    # Breadth-first search from the top-left to the bottom-right cell; None
+    # if the exit can't be reached. The frontier of a perfect maze is only a
+    # few cells wide, so a plain queue beats stepping whole numpy frontiers.
+    rows, cols = walls.shape
+    flat = walls.reshape(-1).tolist()
+    target = rows * cols - 1
+    dist = [-1] * (rows * cols)
+    dist[0] = 0
+    queue = deque([0])
+    steps = ((N, -cols), (E, 1), (S, cols), (W, -1))
+    while queue:
+        cell = queue.popleft()
+        if cell == target:
+            return dist[cell]
+        for bit, delta in steps:
+            if not flat[cell] & bit and dist[cell + delta] < 0:
+                dist[cell + delta] = dist[cell] + 1
+                queue.append(cell + delta)
+    return None
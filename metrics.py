@@ -0,0 +1,133 @@
+import re
+import threading
+import time
+
+from flask import g, request # type: ignore
+
+# Latency buckets in seconds, shared by HTTP and DB histograms
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+\b|%s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def fingerprint(statement):
+    # "SELECT * FROM t WHERE id IN (%s, %s)" -> "SELECT * FROM t WHERE id IN (?+)"
+    text = _WHITESPACE.sub(" ", str(statement)).strip()
+    text = _LITERALS.sub("?", text)
+    text = _IN_LIST.sub("(?+)", text)
+    return text[:200]
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    return ",".join('%s="%s"' % (k, _escape(v)) for k, v in pairs)
+
+
+class Metrics:
+    """Request and query latency collector with Prometheus text output."""
+
+    def __init__(self, slow_query_seconds=0.1):
+        self.slow_query_seconds = slow_query_seconds
+        self._lock = threading.Lock()
+        self._requests = {}   # (endpoint, method) -> Histogram
+        self._statuses = {}   # (endpoint, status) -> count
+        self._queries = {}    # fingerprint -> Histogram
+        self._slow_queries = 0
+        self._gauges = []     # (prefix, callable returning a dict)
+
+    def observe_request(self, endpoint, method, status, seconds):
+        with self._lock:
+            self._requests.setdefault((endpoint, method), Histogram()).observe(seconds)
+            key = (endpoint, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def observe_query(self, statement, seconds):
+        fp = fingerprint(statement)
+        with self._lock:
+            self._queries.setdefault(fp, Histogram()).observe(seconds)
+            if seconds >= self.slow_query_seconds:
+                self._slow_queries += 1
+        if seconds >= self.slow_query_seconds:
+            print("🐢 slow query (%.1f ms): %s" % (seconds * 1000, fp))
+
+    def add_gauges(self, prefix, source):
+        # source() -> {name: number}; non-numeric values are skipped
+        self._gauges.append((prefix, source))
+
+    def install(self, app):
+        @app.before_request
+        def _start_timer():
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def _record_request(response):
+            started = g.pop('request_started', None)
+            if started is not None:
+                self.observe_request(request.endpoint or 'unmatched', request.method,
+                                     response.status_code, time.perf_counter() - started)
+            return response
+
+    def _histogram_lines(self, name, labels, hist):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            lines.append('%s_bucket{%s} %d' % (name, _labels(labels + [("le", bound)]), cumulative))
+        lines.append('%s_bucket{%s} %d' % (name, _labels(labels + [("le", "+Inf")]), hist.total))
+        lines.append('%s_sum{%s} %f' % (name, _labels(labels), hist.sum))
+        lines.append('%s_count{%s} %d' % (name, _labels(labels), hist.total))
+        return lines
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines.append("# HELP maze_http_request_duration_seconds Request latency by endpoint")
+            lines.append("# TYPE maze_http_request_duration_seconds histogram")
+            for (endpoint, method), hist in sorted(self._requests.items()):
+                lines += self._histogram_lines("maze_http_request_duration_seconds",
+                                               [("endpoint", endpoint), ("method", method)], hist)
+
+            lines.append("# HELP maze_http_responses_total Responses by endpoint and status")
+            lines.append("# TYPE maze_http_responses_total counter")
+            for (endpoint, status), count in sorted(self._statuses.items()):
+                lines.append('maze_http_responses_total{%s} %d' % (_labels([("endpoint", endpoint), ("status", status)]), count))
+
+            lines.append("# HELP maze_db_query_duration_seconds Query latency by statement fingerprint")
+            lines.append("# TYPE maze_db_query_duration_seconds histogram")
+            for fp, hist in sorted(self._queries.items()):
+                lines += self._histogram_lines("maze_db_query_duration_seconds", [("query", fp)], hist)
+
+            lines.append("# HELP maze_db_slow_queries_total Queries slower than the slow-query threshold")
+            lines.append("# TYPE maze_db_slow_queries_total counter")
+            lines.append("maze_db_slow_queries_total %d" % self._slow_queries)
+
+        for prefix, source in self._gauges:
+            for key, value in sorted(source().items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = "maze_%s_%s" % (prefix, key)
+                lines.append("# TYPE %s gauge" % name)
+                lines.append("%s %s" % (name, value))
+
+        return "\n".join(lines) + "\n"
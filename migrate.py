@@ -0,0 +1,226 @@
+"""Versioned schema migrations and an index check for the app's queries.
+
+    python migrate.py            apply pending migrations/NNNN_*.sql
+    python migrate.py status     list applied and pending migrations
+    python migrate.py check      EXPLAIN every hot query; exit 1 on a full table or index scan
+
+Applied versions are recorded in `schema_migrations`. MySQL commits DDL
+implicitly, so statements are written to be re-runnable: re-adding a
+column, or an index already covered by an existing one (for a UNIQUE
+index: a unique index on the same columns), is skipped rather than
+treated as a failure.
+"""
+import os
+import re
+import sys
+
+import mysql.connector # type: ignore
+from mysql.connector import errorcode # type: ignore
+
+from settings import config
+from attempt_writer import select_stats_sql
+from profile_cache import SUMMARY_QUERIES
+from verifier import PENDING_SQL
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+SKIPPABLE_ERRORS = {
+    errorcode.ER_DUP_FIELDNAME,   # column already exists
+    errorcode.ER_DUP_KEYNAME,     # index name already exists
+    errorcode.ER_TABLE_EXISTS_ERROR,
+}
+
+_CREATE_INDEX = re.compile(r"CREATE\s+(UNIQUE\s+)?INDEX\s+\w+\s+ON\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+
+# Every per-request SELECT/UPDATE in the app, with sample parameters.
+# These must be served from an index lookup, not a scan of one.
+HOT_QUERIES = [
+    ("login", """
+        SELECT u.*, COALESCE(s.attempts_count, 0) AS attempts_count
+        FROM users u
+        LEFT JOIN user_stats s ON s.user_id = u.id
+        WHERE u.username = %s
+    """, ("player",)),
+    ("unlocked_levels", "SELECT max_level_unlocked FROM users WHERE id = %s", (1,)),
+    ("next_level", "UPDATE users SET max_level_unlocked = GREATEST(max_level_unlocked, %s) WHERE id = %s", (2, 1)),
+    ("rehash", "UPDATE users SET password = %s WHERE id = %s", ("x", 1)),
+    ("submit_stats", select_stats_sql([1]), (1,)),
+    ("profile_user", SUMMARY_QUERIES['user'], (1,)),
+    ("profile_achievements", SUMMARY_QUERIES['user_achievements'], (1,)),
+    ("profile_attempts", """
+        SELECT id, level, score, walls_broken, time_left, created_at
+        FROM attempts
+        WHERE user_id = %s
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """, (1, 21)),
+    ("profile_attempts_after", """
+        SELECT id, level, score, walls_broken, time_left, created_at
+        FROM attempts
+        WHERE user_id = %s
+          AND (created_at < %s OR (created_at = %s AND id < %s))
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """, (1, "2030-01-01 00:00:00", "2030-01-01 00:00:00", 1000, 21)),
+    ("leaderboard_names", "SELECT id, username FROM users WHERE id IN (%s)", (1,)),
+    ("verifier_pending", PENDING_SQL, (1000,)),
+]
+
+# Whole-table loads that are scans on purpose: they run once per cache
+# refresh (question bank, leaderboard seed, achievement catalog), not per request.
+BULK_QUERIES = {
+    "SELECT id, question, option_a, option_b, option_c, option_d, correct_option, difficulty FROM questions",
+    "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM questions",
+    "SELECT user_id, level, score FROM scores",
+    "SELECT code, id FROM achievements",
+    "SELECT code, title, description FROM achievements ORDER BY id",
+}
+
+
+def connect():
+    return mysql.connector.connect(**config)
+
+
+def split_statements(sql):
+    # Drop -- comments, then split on ';' at end of line
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [s.strip() for s in re.split(r";\s*(?:\n|$)", "\n".join(lines)) if s.strip()]
+
+
+def migration_files():
+    files = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r"(\d+)_.*\.sql$", name)
+        if match:
+            files.append((int(match.group(1)), name))
+    return files
+
+
+def ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def index_covered(cursor, table, columns, unique):
+    # A plain index is covered by any index whose leading columns are these;
+    # a unique one only by a unique index on exactly these columns, or the
+    # upserts that rely on it would silently stop deduplicating
+    cursor.execute("""
+        SELECT index_name, MIN(non_unique), GROUP_CONCAT(column_name ORDER BY seq_in_index)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s
+        GROUP BY index_name
+    """, (table,))
+    wanted = [c.strip().lower() for c in columns.split(",")]
+    for _, non_unique, existing in cursor.fetchall():
+        existing = (existing or "").lower().split(",")
+        if unique:
+            if int(non_unique) == 0 and existing == wanted:
+                return True
+        elif existing[:len(wanted)] == wanted:
+            return True
+    return False
+
+
+def run_statement(cursor, statement):
+    match = _CREATE_INDEX.match(statement)
+    if match and index_covered(cursor, match.group(2), match.group(3), unique=bool(match.group(1))):
+        print("   skip (already indexed):", statement.splitlines()[0])
+        return
+    try:
+        cursor.execute(statement)
+    except mysql.connector.Error as e:
+        if e.errno not in SKIPPABLE_ERRORS:
+            raise
+        print("   skip (%s):" % e.msg, statement.splitlines()[0])
+
+
+def migrate():
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        ensure_table(cursor)
+        done = applied_versions(cursor)
+        pending = [(v, name) for v, name in migration_files() if v not in done]
+        if not pending:
+            print("Schema is up to date.")
+        for version, name in pending:
+            print("Applying %s" % name)
+            with open(os.path.join(MIGRATIONS_DIR, name), encoding="utf-8") as f:
+                statements = split_statements(f.read())
+            for statement in statements:
+                run_statement(cursor, statement)
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def status():
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        ensure_table(cursor)
+        done = applied_versions(cursor)
+        for version, name in migration_files():
+            print("%s  %s" % ("applied" if version in done else "PENDING", name))
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def check():
+    conn = connect()
+    cursor = conn.cursor(dictionary=True)
+    failures = 0
+    try:
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = cursor.fetchall()
+            # ALL reads every row; index reads every entry of an index, which
+            # grows with the table just the same
+            scans = [row for row in plan if (row.get("type") or "").upper() in ("ALL", "INDEX")]
+            if scans:
+                failures += 1
+                print("FULL SCAN  %-24s %s" % (name, ", ".join("%s:%s" % (r.get("table"), r.get("type")) for r in scans)))
+            else:
+                print("ok         %-24s %s" % (name, ", ".join("%s:%s" % (r.get("table"), r.get("key")) for r in plan)))
+        for sql in sorted(BULK_QUERIES):
+            print("bulk       %s" % sql)
+    finally:
+        cursor.close()
+        conn.close()
+
+    if failures:
+        print("%d quer%s would scan a whole table or index." % (failures, "y" if failures == 1 else "ies"))
+        return 1
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "migrate"
+    if command == "migrate":
+        migrate()
+    elif command == "status":
+        status()
+    elif command == "check":
+        sys.exit(check())
+    else:
+        print(__doc__)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
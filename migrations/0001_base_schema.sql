@@ -0,0 +1,75 @@
+-- Full schema for the tables app.py uses. Safe on databases created from
+-- the old schema.sql: every table is CREATE ... IF NOT EXISTS, and the
+-- columns/indexes those databases lack are added in 0002.
+
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(64) NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    max_level_unlocked INT NOT NULL DEFAULT 1,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_users_username (username)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    question TEXT NOT NULL,
+    option_a VARCHAR(255),
+    option_b VARCHAR(255),
+    option_c VARCHAR(255),
+    option_d VARCHAR(255),
+    correct_option CHAR(1) NOT NULL,
+    difficulty ENUM('easy', 'medium', 'hard', 'extreme') NOT NULL DEFAULT 'easy',
+    KEY idx_questions_difficulty (difficulty)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS attempts (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    level INT NOT NULL,
+    score INT NOT NULL,
+    walls_broken INT NOT NULL DEFAULT 0,
+    time_left INT NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- profile history: WHERE user_id = ? ORDER BY created_at DESC, id DESC (keyset)
+    KEY idx_attempts_user_created (user_id, created_at, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS scores (
+    user_id INT NOT NULL,
+    level INT NOT NULL,
+    score INT NOT NULL,
+    -- submit_score upsert target
+    PRIMARY KEY (user_id, level)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS achievements (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    code VARCHAR(32) NOT NULL,
+    title VARCHAR(100) NOT NULL,
+    description VARCHAR(255),
+    UNIQUE KEY uq_achievements_code (code)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS user_achievements (
+    user_id INT NOT NULL,
+    achievement_id INT NOT NULL,
+    awarded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- INSERT IGNORE relies on this to skip achievements already held
+    PRIMARY KEY (user_id, achievement_id),
+    -- profile: WHERE user_id = ? ORDER BY awarded_at DESC
+    KEY idx_user_achievements_user_awarded (user_id, awarded_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INT PRIMARY KEY,
+    attempts_count INT NOT NULL DEFAULT 0,
+    total_score BIGINT NOT NULL DEFAULT 0,
+    total_walls_broken INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO achievements (code, title, description) VALUES
+('FIRST_WIN', 'First Win', 'Complete your first maze'),
+('NO_WALL_BREAK', 'Pathfinder', 'Finish a level without breaking a wall'),
+('FAST_FINISH', 'Speedrunner', 'Finish a level with 30 seconds or more left'),
+('WALL_BREAKER', 'Wall Breaker', 'Break 10 walls in total');
@@ -0,0 +1,23 @@
+-- Bring databases created from the old schema.sql up to 0001. Statements
+-- whose column or index already exists are skipped by the runner.
+
+ALTER TABLE questions ADD COLUMN difficulty ENUM('easy', 'medium', 'hard', 'extreme') NOT NULL DEFAULT 'easy';
+ALTER TABLE users ADD COLUMN max_level_unlocked INT NOT NULL DEFAULT 1;
+
+CREATE UNIQUE INDEX uq_users_username ON users (username);
+CREATE INDEX idx_questions_difficulty ON questions (difficulty);
+CREATE INDEX idx_attempts_user_created ON attempts (user_id, created_at, id);
+CREATE UNIQUE INDEX uq_scores_user_level ON scores (user_id, level);
+CREATE UNIQUE INDEX uq_achievements_code ON achievements (code);
+CREATE UNIQUE INDEX uq_user_achievements_user_ach ON user_achievements (user_id, achievement_id);
+CREATE INDEX idx_user_achievements_user_awarded ON user_achievements (user_id, awarded_at);
+
+-- user_stats may predate this runner (see schema.sql); backfill it from history
+INSERT INTO user_stats (user_id, attempts_count, total_score, total_walls_broken)
+SELECT user_id, COUNT(*), COALESCE(SUM(score), 0), COALESCE(SUM(walls_broken), 0)
+FROM attempts
+GROUP BY user_id
+ON DUPLICATE KEY UPDATE
+    attempts_count = VALUES(attempts_count),
+    total_score = VALUES(total_score),
+    total_walls_broken = VALUES(total_walls_broken);
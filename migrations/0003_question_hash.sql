@@ -0,0 +1,7 @@
+-- Dedupe key for the question bank: SHA-256 of the normalised question
+-- text (see questions_cli.normalise). Computed in Python, so rows that
+-- predate this column stay NULL until `python questions_cli.py backfill`
+-- (run automatically before every import) fills them in.
+
+ALTER TABLE questions ADD COLUMN question_hash BINARY(32) NULL;
+CREATE UNIQUE INDEX uq_questions_hash ON questions (question_hash);
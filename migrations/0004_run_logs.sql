@@ -0,0 +1,26 @@
+-- Move logs uploaded with submit_score, checked off the request path by
+-- verifier.py. The maze columns are what /get_maze served for the run
+-- (NULL if the client built its own maze and the run can't be replayed).
+
+CREATE TABLE IF NOT EXISTS run_logs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    level INT NOT NULL,
+    score INT NOT NULL,
+    walls_broken INT NOT NULL,
+    time_left INT NOT NULL,
+    maze_cols INT NULL,
+    maze_rows INT NULL,
+    maze_seed BIGINT NULL,
+    maze_algorithm VARCHAR(32) NULL,
+    moves MEDIUMTEXT NOT NULL,
+    move_count INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status ENUM('pending', 'ok', 'rejected', 'unverifiable') NOT NULL DEFAULT 'pending',
+    reason VARCHAR(255) NULL,
+    optimal_moves INT NULL,
+    verified_at DATETIME NULL,
+    -- verifier: WHERE status = 'pending' AND id > ? ORDER BY id
+    KEY idx_run_logs_status (status, id),
+    KEY idx_run_logs_user (user_id, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,31 @@
+import hashlib
+
+from flask import make_response, render_template, request # type: ignore
+
+
+class PageCache:
+    """Rendered HTML for pages that look the same to every visitor.
+
+    render() keys on the template and its context, so each variant (e.g.
+    the login page with a given error) is rendered once per process. Pages
+    carry an ETag and `no-cache`, so browsers revalidate and a repeat visit
+    gets an empty 304. Skipped while templates auto-reload (debug), so
+    template edits still show up.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._pages = {}
+
+    def render(self, template, status=200, **context):
+        key = (template, tuple(sorted(context.items())))
+        page = self._pages.get(key)
+        if page is None or self.app.jinja_env.auto_reload:
+            body = render_template(template, **context)
+            page = (body, hashlib.sha256(body.encode("utf-8")).hexdigest()[:16])
+            self._pages[key] = page
+
+        response = make_response(page[0], status)
+        response.set_etag(page[1])
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash # type: ignore
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs werkzeug's password hashing on a bounded worker pool.
+
+    Hashing is deliberately slow, so doing it inline ties up a request
+    worker for the whole computation. Here at most `max_pending` hashes
+    may be queued or running; past that, callers wait up to `timeout`
+    seconds and then get HasherBusy (the route answers 503).
+
+    `method` is a werkzeug method string such as "scrypt:32768:8:1" or
+    "pbkdf2:sha256:600000". Shorthands like "scrypt" are fine: the full
+    prefix werkzeug writes is learned from one hash at startup. Hashes made
+    with any other method are reported by needs_rehash() so login can
+    upgrade them.
+    """
+
+    def __init__(self, method="scrypt:32768:8:1", workers=4, max_pending=32, timeout=5.0, use_processes=False):
+        self.method = method
+        # werkzeug hashes look like "<method>$<salt>$<hash>", with defaults filled in
+        self._prefix = generate_password_hash("", method).split("$", 1)[0]
+        self.timeout = timeout
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor_class(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy("Password hashing queue is full")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
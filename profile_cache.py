@@ -0,0 +1,91 @@
+from ttl_cache import TTLCache
+
+SUMMARY_QUERIES = {
+    'user': """
+        SELECT u.id, u.username,
+               COALESCE(s.total_score, 0) AS total_score,
+               COALESCE(s.attempts_count, 0) AS attempts_count
+        FROM users u
+        LEFT JOIN user_stats s ON s.user_id = u.id
+        WHERE u.id = %s
+    """,
+    'user_achievements': """
+        SELECT a.code, a.title, a.description, ua.awarded_at
+        FROM user_achievements ua
+        JOIN achievements a ON ua.achievement_id = a.id
+        WHERE ua.user_id = %s
+        ORDER BY ua.awarded_at DESC
+    """,
+}
+
+ALL_ACHIEVEMENTS_QUERY = "SELECT code, title, description FROM achievements ORDER BY id"
+
+
+def build_summary(user, user_achievements, all_achievements):
+    if user is None:
+        return None
+    return {
+        'user': {'id': user['id'], 'username': user['username']},
+        'stats': {'total_score': user['total_score'], 'attempts_count': user['attempts_count']},
+        'user_achievements': user_achievements,
+        'all_achievements': all_achievements,
+    }
+
+
+class ProfileCache:
+    """Per-user profile summary (user row, totals, achievements).
+
+    Totals come from `user_stats`, so building a summary costs the same no
+    matter how many attempts a player has. attempts_count only ever goes up,
+    so it doubles as a version stamp like ProgressCache's: login and
+    submit_score keep the count the session knows about in the (signed)
+    session, and an entry below it is stale in every worker, not just the one
+    that committed. Runs still waiting in the write-behind queue keep the
+    entry stale, so it is re-read until they land. Entries also expire after
+    `ttl` seconds for changes the session doesn't know about.
+    """
+
+    def __init__(self, pool, max_entries=10000, ttl=120):
+        self.pool = pool
+        self._cache = TTLCache(max_entries, ttl)
+        self._all_achievements = None
+
+    def all_achievements(self, cursor=None):
+        # Global and static; loaded once per process
+        if self._all_achievements is None:
+            if cursor is None:
+                with self.pool.cursor(dictionary=True) as (conn, own_cursor):
+                    return self.all_achievements(own_cursor)
+            cursor.execute(ALL_ACHIEVEMENTS_QUERY)
+            self._all_achievements = cursor.fetchall()
+        return self._all_achievements
+
+    def peek(self, user_id, min_version=0):
+        # Cached summary, or None if missing, expired or older than min_version
+        return self._cache.get(user_id, valid=lambda summary: summary['stats']['attempts_count'] >= min_version)
+
+    def put(self, user_id, summary):
+        self._cache.put(user_id, summary)
+
+    def get(self, user_id, min_version=0):
+        summary = self.peek(user_id, min_version)
+        if summary is not None:
+            return summary
+
+        with self.pool.cursor(dictionary=True) as (conn, cursor):
+            cursor.execute(SUMMARY_QUERIES['user'], (user_id,))
+            user = cursor.fetchone()
+            cursor.execute(SUMMARY_QUERIES['user_achievements'], (user_id,))
+            user_achievements = cursor.fetchall()
+            all_achievements = self.all_achievements(cursor)
+
+        summary = build_summary(user, user_achievements, all_achievements)
+        if summary is not None:
+            self.put(user_id, summary)
+        return summary
+
+    def invalidate(self, user_id):
+        self._cache.invalidate(user_id)
+
+    def stats(self):
+        return self._cache.stats()
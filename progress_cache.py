@@ -0,0 +1,54 @@
+from ttl_cache import TTLCache
+
+
+class ProgressCache:
+    """LRU + TTL cache of users.max_level_unlocked.
+
+    Unlocks only ever go up, which gives a cheap cross-worker version stamp:
+    next_level stores the new value in the (signed) session, and any worker
+    whose cached value is below that stamp treats the entry as stale and
+    re-reads it. Other workers' changes that the session doesn't know about
+    (e.g. another device) are picked up once the entry's TTL runs out.
+    """
+
+    def __init__(self, pool, max_entries=10000, ttl=60):
+        self.pool = pool
+        self._cache = TTLCache(max_entries, ttl)
+
+    def peek(self, user_id, min_version=0):
+        # Cached value, or None if missing, expired or older than min_version
+        return self._cache.get(user_id, valid=lambda max_level: max_level >= min_version)
+
+    def put(self, user_id, max_level):
+        self._cache.put(user_id, max_level)
+
+    def invalidate(self, user_id):
+        self._cache.invalidate(user_id)
+
+    def get(self, user_id, min_version=0):
+        cached = self.peek(user_id, min_version)
+        if cached is not None:
+            return cached
+        with self.pool.cursor() as (conn, cursor):
+            cursor.execute("SELECT max_level_unlocked FROM users WHERE id = %s", (user_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        max_level = row[0] or 1
+        self.put(user_id, max_level)
+        return max_level
+
+    def unlock(self, user_id, level):
+        # Write-through; returns the user's new max_level_unlocked
+        with self.pool.cursor() as (conn, cursor):
+            cursor.execute("UPDATE users SET max_level_unlocked = GREATEST(max_level_unlocked, %s) WHERE id = %s",
+                           (level, user_id))
+            cursor.execute("SELECT max_level_unlocked FROM users WHERE id = %s", (user_id,))
+            row = cursor.fetchone()
+            conn.commit()
+        max_level = row[0] if row else level
+        self.put(user_id, max_level)
+        return max_level
+
+    def stats(self):
+        return self._cache.stats()
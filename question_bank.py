@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+
+
+class QuestionBank:
+    """Process-local copy of the `questions` table.
+
+    Questions are indexed by difficulty (for random picks) and by id (for
+    answer checks), so gameplay never has to touch MySQL. The snapshot is
+    refreshed when it is older than `ttl` seconds, and re-checked every
+    `check_interval` seconds against a cheap version query so new or
+    deleted questions show up without waiting for the full TTL. An unknown
+    id forces an early version check, at most once per `recheck_interval`
+    seconds, so bogus ids can't put MySQL back on the answer path.
+
+    With `auto_refresh` off, readers never touch MySQL and the snapshot only
+    changes through refresh() (async mode runs that in a background task).
+    """
+
+    VERSION_QUERY = "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM questions"
+    LOAD_QUERY = """
+        SELECT id, question, option_a, option_b, option_c, option_d, correct_option, difficulty
+        FROM questions
+    """
+
+    def __init__(self, pool, ttl=600, check_interval=30, recheck_interval=1.0):
+        self.pool = pool
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.recheck_interval = recheck_interval
+        self.auto_refresh = True
+        self._rechecked_at = 0.0
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_difficulty = {}
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    def _read_version(self, cursor):
+        cursor.execute(self.VERSION_QUERY)
+        return tuple(cursor.fetchone())
+
+    def reload(self):
+        with self.pool.cursor(dictionary=True) as (conn, cursor):
+            cursor.execute(self.LOAD_QUERY)
+            rows = cursor.fetchall()
+            cursor.execute(self.VERSION_QUERY)
+            version = tuple(cursor.fetchone().values())
+
+        by_id = {}
+        by_difficulty = {}
+        for row in rows:
+            by_id[row['id']] = row
+            by_difficulty.setdefault(row['difficulty'], []).append(row)
+
+        # Swap the whole snapshot at once; readers keep whatever they already hold
+        now = time.monotonic()
+        self._by_id, self._by_difficulty = by_id, by_difficulty
+        self._version = version
+        self._loaded_at = self._checked_at = now
+
+    def invalidate(self):
+        # Force a reload on next access (e.g. after importing new questions)
+        self._loaded_at = self._checked_at = 0.0
+
+    def _ensure_fresh(self, force=False):
+        if not (self.auto_refresh or force):
+            return
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        if not self._lock.acquire(blocking=self._version is None):
+            return  # someone else is refreshing; serve the current snapshot
+        try:
+            now = time.monotonic()
+            if self._version is None or now - self._loaded_at >= self.ttl:
+                self.reload()
+            elif now - self._checked_at >= self.check_interval:
+                with self.pool.cursor() as (conn, cursor):
+                    version = self._read_version(cursor)
+                if version != self._version:
+                    self.reload()
+                else:
+                    self._checked_at = now
+        finally:
+            self._lock.release()
+
+    def refresh(self):
+        # Reload now if the snapshot is stale; normally done lazily on access
+        self._ensure_fresh(force=True)
+
+    def random_question(self, difficulty):
+        self._ensure_fresh()
+        pool = self._by_difficulty.get(difficulty)
+        if not pool:
+            return None
+        return random.choice(pool)
+
+    def sample(self, difficulty, n, exclude=()):
+        # Up to n distinct questions not in `exclude`. Random probing keeps
+        # this O(n) while most of the bank is unused; once the run has seen
+        # most of it we fall back to filtering the whole list.
+        self._ensure_fresh()
+        pool = self._by_difficulty.get(difficulty) or []
+        exclude = set(exclude)
+        picked = {}
+        tries = 0
+        while len(picked) < n and tries < 4 * n:
+            question = random.choice(pool) if pool else None
+            if question is None:
+                break
+            if question['id'] not in exclude:
+                picked[question['id']] = question
+            tries += 1
+
+        if len(picked) < n:
+            rest = [q for q in pool if q['id'] not in exclude and q['id'] not in picked]
+            picked.update((q['id'], q) for q in random.sample(rest, min(n - len(picked), len(rest))))
+        return list(picked.values())
+
+    def get(self, qid):
+        if not isinstance(qid, int) or isinstance(qid, bool):
+            return None
+        self._ensure_fresh()
+        question = self._by_id.get(qid)
+        now = time.monotonic()
+        if question is None and self.auto_refresh and now - self._rechecked_at >= self.recheck_interval:
+            # Possibly a question added since the last check; re-check the
+            # version (cheap) rather than reloading on every unknown id
+            self._rechecked_at = now
+            self._checked_at = 0.0
+            self._ensure_fresh()
+            question = self._by_id.get(qid)
+        return question
+
+    def check_answer(self, qid, answer):
+        question = self.get(qid)
+        if question is None:
+            return None
+        return answer == question['correct_option']
@@ -0,0 +1,300 @@
+"""Bulk import/export for the question bank.
+
+    python questions_cli.py import bank.jsonl [--batch-size 1000] [--dry-run]
+    python questions_cli.py import bank.csv
+    python questions_cli.py export out.jsonl      (or out.csv, or - for stdout)
+    python questions_cli.py backfill              hash rows added before migration 0003
+    python questions_cli.py backfill --delete-duplicates
+
+Rows carry the `questions` columns: question, option_a..option_d,
+correct_option (A-D) and difficulty (easy/medium/hard/extreme, default
+easy). Files are streamed row by row and written in `--batch-size`
+transactions, so neither side holds the bank in memory or keeps the table
+locked for long. Duplicates are detected with a unique index on a hash of
+the normalised question text and skipped. Running apps pick up imported
+questions on their next QuestionBank version check.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+
+import mysql.connector # type: ignore
+
+from settings import config
+
+COLUMNS = ("question", "option_a", "option_b", "option_c", "option_d", "correct_option", "difficulty")
+OPTIONS = ("A", "B", "C", "D")
+DIFFICULTIES = ("easy", "medium", "hard", "extreme")
+MAX_OPTION_LENGTH = 255
+
+INSERT_SQL = """
+    INSERT INTO questions (question, option_a, option_b, option_c, option_d, correct_option, difficulty, question_hash)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE id = id
+"""
+
+_QUOTES = dict.fromkeys(map(ord, "\"'“”‘’«»"))
+_SPACES = re.compile(r"\s+")
+
+
+class InvalidQuestion(ValueError):
+    pass
+
+
+def normalise(text):
+    # Case, quote style, spacing and trailing punctuation don't make a new question
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_QUOTES)
+    return _SPACES.sub(" ", text).strip().rstrip("?.!: ")
+
+
+def question_hash(text):
+    return hashlib.sha256(normalise(text).encode("utf-8")).digest()
+
+
+def validate(raw):
+    row = {}
+    for column in COLUMNS:
+        value = raw.get(column)
+        row[column] = "" if value is None else str(value).strip()
+
+    if not normalise(row['question']):
+        raise InvalidQuestion("question is empty")
+    for column in ("option_a", "option_b", "option_c", "option_d"):
+        if not row[column]:
+            raise InvalidQuestion("%s is empty" % column)
+        if len(row[column]) > MAX_OPTION_LENGTH:
+            raise InvalidQuestion("%s is longer than %d characters" % (column, MAX_OPTION_LENGTH))
+
+    row['correct_option'] = row['correct_option'].upper()
+    if row['correct_option'] not in OPTIONS:
+        raise InvalidQuestion("correct_option must be one of A, B, C, D (got %r)" % raw.get('correct_option'))
+
+    row['difficulty'] = row['difficulty'].lower() or "easy"
+    if row['difficulty'] not in DIFFICULTIES:
+        raise InvalidQuestion("difficulty must be one of %s (got %r)" % (", ".join(DIFFICULTIES), raw.get('difficulty')))
+    return row
+
+
+def open_input(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
+
+
+def open_output(path):
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def guess_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(f, fmt):
+    # Yields (line number, raw dict or None, error)
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, "invalid JSON: %s" % e
+            continue
+        if not isinstance(raw, dict):
+            yield line_no, None, "expected a JSON object"
+            continue
+        yield line_no, raw, None
+
+
+def batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def backfill(conn, batch_size=1000, delete_duplicates=False):
+    """Fill in question_hash for rows that predate it.
+
+    Rows are walked in id order, so of each group of duplicates the oldest
+    question gets the hash. The unique index keeps the others at NULL; they
+    are reported, and only deleted with `delete_duplicates`.
+    """
+    cursor = conn.cursor()
+    last_id = 0
+    hashed = duplicate_count = 0
+    try:
+        while True:
+            cursor.execute(
+                "SELECT id, question FROM questions WHERE question_hash IS NULL AND id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            hashes = {qid: question_hash(text) for qid, text in rows}
+            digests = tuple(set(hashes.values()))
+            placeholders = ", ".join(["%s"] * len(digests))
+            cursor.execute("SELECT question_hash FROM questions WHERE question_hash IN (%s)" % placeholders, digests)
+            taken = {bytes(h) for (h,) in cursor.fetchall()}
+
+            updates, duplicates = [], []
+            for qid, digest in hashes.items():
+                if digest in taken:
+                    duplicates.append((qid,))
+                else:
+                    taken.add(digest)
+                    updates.append((digest, qid))
+            if updates:
+                cursor.executemany("UPDATE questions SET question_hash = %s WHERE id = %s", updates)
+            if duplicates:
+                ids = ", ".join(str(d[0]) for d in duplicates)
+                if delete_duplicates:
+                    cursor.executemany("DELETE FROM questions WHERE id = %s", duplicates)
+                    print("🗑️ Removed duplicate question ids:", ids, file=sys.stderr)
+                else:
+                    print("⚠️ Duplicate question ids left unhashed:", ids, file=sys.stderr)
+            conn.commit()
+            hashed += len(updates)
+            duplicate_count += len(duplicates)
+    finally:
+        cursor.close()
+    return hashed, duplicate_count
+
+
+def import_questions(args):
+    fmt = guess_format(args.path, args.format)
+    counts = {'read': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0}
+
+    def valid_rows(f):
+        for line_no, raw, error in read_rows(f, fmt):
+            counts['read'] += 1
+            if error is None:
+                try:
+                    row = validate(raw)
+                except InvalidQuestion as e:
+                    error = str(e)
+            if error is not None:
+                counts['rejected'] += 1
+                print("❌ %s:%d: %s" % (args.path, line_no, error), file=sys.stderr)
+                continue
+            yield tuple(row[c] for c in COLUMNS) + (question_hash(row['question']),)
+
+    conn = None if args.dry_run else mysql.connector.connect(**config)
+    try:
+        if conn is not None:
+            hashed, duplicates = backfill(conn, args.batch_size)
+            if hashed or duplicates:
+                print("Hashed %d existing questions, %d duplicates left unhashed" % (hashed, duplicates))
+            cursor = conn.cursor()
+        with open_input(args.path) as f:
+            for batch in batches(valid_rows(f), args.batch_size):
+                if conn is None:
+                    continue
+                cursor.executemany(INSERT_SQL, batch)
+                conn.commit()
+                # Duplicate-key rows are left untouched and report 0 affected rows
+                counts['inserted'] += max(cursor.rowcount, 0)
+                counts['duplicates'] += len(batch) - max(cursor.rowcount, 0)
+        if conn is not None:
+            cursor.close()
+    finally:
+        if conn is not None:
+            conn.close()
+
+    print("read %(read)d, inserted %(inserted)d, duplicates %(duplicates)d, rejected %(rejected)d" % counts)
+    return 1 if counts['rejected'] else 0
+
+
+def export_questions(args):
+    fmt = guess_format(args.path, args.format)
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor(dictionary=True)
+    exported = 0
+    try:
+        with open_output(args.path) as out:
+            writer = None
+            if fmt == "csv":
+                writer = csv.DictWriter(out, fieldnames=COLUMNS)
+                writer.writeheader()
+            # Keyset pages by id: each page is a short read, nothing stays locked
+            last_id = 0
+            while True:
+                cursor.execute(
+                    "SELECT id, %s FROM questions WHERE id > %%s ORDER BY id LIMIT %%s" % ", ".join(COLUMNS),
+                    (last_id, args.batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                for row in rows:
+                    record = {c: row[c] for c in COLUMNS}
+                    if writer is not None:
+                        writer.writerow(record)
+                    else:
+                        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                exported += len(rows)
+    finally:
+        cursor.close()
+        conn.close()
+    print("exported %d questions" % exported, file=sys.stderr)
+    return 0
+
+
+def run_backfill(args):
+    conn = mysql.connector.connect(**config)
+    try:
+        hashed, duplicates = backfill(conn, args.batch_size, args.delete_duplicates)
+    finally:
+        conn.close()
+    print("Hashed %d questions, %s %d duplicates" % (
+        hashed, "removed" if args.delete_duplicates else "left unhashed", duplicates))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import/export the question bank")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import", help="load questions from JSONL or CSV")
+    p.add_argument("path", help="input file, or - for stdin")
+    p.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--dry-run", action="store_true", help="validate only; don't touch the database")
+    p.set_defaults(fn=import_questions)
+
+    p = commands.add_parser("export", help="write every question as JSONL or CSV")
+    p.add_argument("path", help="output file, or - for stdout")
+    p.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.set_defaults(fn=export_questions)
+
+    p = commands.add_parser("backfill", help="hash existing questions and report duplicates")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--delete-duplicates", action="store_true",
+                   help="delete duplicate questions instead of leaving them unhashed")
+    p.set_defaults(fn=run_backfill)
+
+    args = parser.parse_args(argv)
+    sys.exit(args.fn(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+-- Existing databases: apply migrations/ with `python migrate.py` instead of re-running this file.
+
 -- Create a new database called maze_game
 CREATE DATABASE maze_game;
 
@@ -82,4 +84,21 @@ ALTER TABLE users ADD COLUMN max_level_unlocked INT DEFAULT 1;
     update questions set difficulty='easy' where id=1;
     update questions set difficulty='medium' where id=2;
     update questions set difficulty='hard' where id=3;
-    update questions set difficulty='extreme' where id=4;
\ No newline at end of file
+    update questions set difficulty='extreme' where id=4;
+-- Running per-user totals, kept up to date by submit_score
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INT PRIMARY KEY,
+    attempts_count INT NOT NULL DEFAULT 0,
+    total_score BIGINT NOT NULL DEFAULT 0,
+    total_walls_broken INT NOT NULL DEFAULT 0
+);
+
+-- Backfill from existing history
+INSERT INTO user_stats (user_id, attempts_count, total_score, total_walls_broken)
+SELECT user_id, COUNT(*), COALESCE(SUM(score), 0), COALESCE(SUM(walls_broken), 0)
+FROM attempts
+GROUP BY user_id
+ON DUPLICATE KEY UPDATE
+    attempts_count = VALUES(attempts_count),
+    total_score = VALUES(total_score),
+    total_walls_broken = VALUES(total_walls_broken);
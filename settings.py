@@ -0,0 +1,21 @@
+# Plain data shared by app.py and the command-line tools (migrate.py,
+# questions_cli.py, verifier.py), which import it without building the app.
+
+# Level Configurations
+levels = {
+    1: {"cols": 10, "rows": 10, "difficulty": "easy", "wall_break_limit": 10, "time_limit": 50},
+    2: {"cols": 20, "rows": 20, "difficulty": "medium", "wall_break_limit": 7, "time_limit": 120},
+    3: {"cols": 30, "rows": 30, "difficulty": "hard", "wall_break_limit": 5, "time_limit": 180},
+    4: {"cols": 40, "rows": 40, "difficulty": "extreme", "wall_break_limit": 3, "time_limit": 200}
+}
+
+# MySQL Configuration
+config = {
+    "host": "localhost",
+    "user": "root",
+    "password": "root",
+    "database": "maze_game",
+    "charset": "utf8mb4",
+    "collation": "utf8mb4_unicode_ci",
+    "use_unicode": True
+}
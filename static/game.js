@@ -14,6 +14,19 @@ let gameWon = false;
 let wallsBroken = 0;
 let wallBreakAnimations = [];
 let countdown;
+let questionQueue = [];
+let prefetching = null;
+let moveLog = [];
+let mazeSeed = null;
+
+// Walls are drawn once into this offscreen layer and copied onto the
+// main canvas each frame; it is rebuilt only when mazeDirty is set.
+const mazeLayer = document.createElement("canvas");
+const layerCtx = mazeLayer.getContext("2d");
+const LAYER_PAD = 8; // room for the wall glow around the outer edge
+let mazeDirty = true;
+let frameDirty = true;
+let lastPlayer = { x: -1, y: -1 };
 
 // UI
 const timerElement = document.getElementById("timer");
@@ -35,6 +48,11 @@ function initMaze(config) {
   gameWon = false;
   wallsBroken = 0;
   wallBreakAnimations = [];
+  questionQueue = [];
+  mazeDirty = true;
+  frameDirty = true;
+  moveLog = [];
+  mazeSeed = null;
 
   // Create cells
   for (let y = 0; y < rows; y++) {
@@ -45,11 +63,38 @@ function initMaze(config) {
 
   current = mazeGrid[0];
 
-  buildMaze(() => {
+  const start = () => {
     drawMaze();
     gameLoop();
     initTimer();
+    prefetchQuestions();
+  };
+
+  // Server-generated maze; fall back to building it in the browser
+  loadMaze()
+    .then(start)
+    .catch(() => buildMaze(start));
+}
+
+// Walls arrive as 4 bits per cell (top=1, right=2, bottom=4, left=8),
+// two cells per byte, base64 encoded.
+async function loadMaze() {
+  const res = await fetch(`/get_maze?cols=${cols}&rows=${rows}`);
+  if (!res.ok) throw new Error("maze request failed");
+  const data = await res.json();
+  const bytes = atob(data.walls);
+  mazeSeed = data.seed;
+
+  mazeGrid.forEach((cell, i) => {
+    const b = bytes.charCodeAt(i >> 1);
+    const bits = i & 1 ? b >> 4 : b & 15;
+    cell.walls = [!!(bits & 1), !!(bits & 2), !!(bits & 4), !!(bits & 8)];
+    cell.visited = true;
   });
+  mazeDirty = true;
+
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  centerMazeOnCanvas();
 }
 
 // ---------------------------------------------------
@@ -115,39 +160,12 @@ class Cell {
       ? neighbors[Math.floor(Math.random() * neighbors.length)]
       : undefined;
   }
-
-  draw() {
-    const x = this.x * cellSize;
-    const y = this.y * cellSize;
-
-    ctx.fillStyle = this.visited ? "#111" : "#000";
-    ctx.fillRect(x, y, cellSize, cellSize);
-
-    ctx.strokeStyle = "#00ffff";
-    ctx.lineWidth = 2;
-    ctx.shadowColor = "#00ffff";
-    ctx.shadowBlur = 6;
-
-    if (this.walls[0]) drawLine(x, y, x + cellSize, y);
-    if (this.walls[1]) drawLine(x + cellSize, y, x + cellSize, y + cellSize);
-    if (this.walls[2]) drawLine(x + cellSize, y + cellSize, x, y + cellSize);
-    if (this.walls[3]) drawLine(x, y + cellSize, x, y);
-
-    ctx.shadowBlur = 0;
-  }
 }
 
 // ---------------------------------------------------
 // MAZE GENERATION
 // ---------------------------------------------------
 
-function drawLine(x1, y1, x2, y2) {
-  ctx.beginPath();
-  ctx.moveTo(x1, y1);
-  ctx.lineTo(x2, y2);
-  ctx.stroke();
-}
-
 function removeWalls(a, b) {
   const dx = a.x - b.x;
   const dy = a.y - b.y;
@@ -163,6 +181,8 @@ function removeWalls(a, b) {
   } else if (dy === -1) {
     a.walls[2] = false; b.walls[0] = false;
   }
+
+  mazeDirty = true;
 }
 
 function generateMazeStep() {
@@ -182,6 +202,7 @@ function generateMazeStep() {
 function buildMaze(callback) {
   function loop() {
     for (let i = 0; i < 15; i++) generateMazeStep();
+    mazeDirty = true; // cells change colour as they are visited
 
     ctx.clearRect(0, 0, canvas.width, canvas.height);
     centerMazeOnCanvas();
@@ -193,8 +214,57 @@ function buildMaze(callback) {
   loop();
 }
 
+// ---------------------------------------------------
+// MAZE LAYER
+// ---------------------------------------------------
+
+// Redraw every wall into the offscreen layer as one path and one stroke.
+// Each cell contributes its top and left wall; the right and bottom edges
+// of the maze come from the last column and row, so no wall is drawn twice.
+function renderMazeLayer() {
+  const width = cols * cellSize;
+  const height = rows * cellSize;
+  mazeLayer.width = Math.ceil(width + 2 * LAYER_PAD);
+  mazeLayer.height = Math.ceil(height + 2 * LAYER_PAD);
+
+  layerCtx.setTransform(1, 0, 0, 1, LAYER_PAD, LAYER_PAD);
+  layerCtx.fillStyle = "#000";
+  layerCtx.fillRect(0, 0, width, height);
+
+  layerCtx.beginPath();
+  mazeGrid.forEach(cell => {
+    if (cell.visited) layerCtx.rect(cell.x * cellSize, cell.y * cellSize, cellSize, cellSize);
+  });
+  layerCtx.fillStyle = "#111";
+  layerCtx.fill();
+
+  layerCtx.beginPath();
+  mazeGrid.forEach(cell => {
+    const x = cell.x * cellSize;
+    const y = cell.y * cellSize;
+    if (cell.walls[0]) { layerCtx.moveTo(x, y); layerCtx.lineTo(x + cellSize, y); }
+    if (cell.walls[3]) { layerCtx.moveTo(x, y); layerCtx.lineTo(x, y + cellSize); }
+    if (cell.x === cols - 1 && cell.walls[1]) {
+      layerCtx.moveTo(x + cellSize, y); layerCtx.lineTo(x + cellSize, y + cellSize);
+    }
+    if (cell.y === rows - 1 && cell.walls[2]) {
+      layerCtx.moveTo(x, y + cellSize); layerCtx.lineTo(x + cellSize, y + cellSize);
+    }
+  });
+  layerCtx.strokeStyle = "#00ffff";
+  layerCtx.lineWidth = 2;
+  layerCtx.shadowColor = "#00ffff";
+  layerCtx.shadowBlur = 6;
+  layerCtx.stroke();
+  layerCtx.shadowBlur = 0;
+
+  mazeDirty = false;
+  frameStats.layerBuilds++;
+}
+
 function drawMaze() {
-  mazeGrid.forEach(cell => cell.draw());
+  if (mazeDirty) renderMazeLayer();
+  ctx.drawImage(mazeLayer, -LAYER_PAD, -LAYER_PAD);
 }
 
 function centerMazeOnCanvas() {
@@ -212,6 +282,36 @@ function animateWallBreak(cellA, cellB, wallIndex, duration = 90) {
   wallBreakAnimations.push({ cellA, cellB, wallIndex, frame: 0, duration });
 }
 
+// ---------------------------------------------------
+// QUESTION PREFETCH
+// ---------------------------------------------------
+
+const PREFETCH_BATCH = 5;
+const PREFETCH_LOW_WATER = 2;
+
+// Keep a few questions on hand so hitting a wall opens the modal
+// without waiting for the network.
+function prefetchQuestions() {
+  if (prefetching) return prefetching;
+
+  prefetching = fetch(`/get_questions?n=${PREFETCH_BATCH}`)
+    .then(res => res.json())
+    .then(data => {
+      if (data.questions) questionQueue.push(...data.questions);
+    })
+    .catch(() => {})
+    .finally(() => { prefetching = null; });
+
+  return prefetching;
+}
+
+async function nextQuestion() {
+  if (!questionQueue.length) await prefetchQuestions();
+  const q = questionQueue.shift();
+  if (questionQueue.length < PREFETCH_LOW_WATER) prefetchQuestions();
+  return q;
+}
+
 // ---------------------------------------------------
 // QUESTION MODAL
 // ---------------------------------------------------
@@ -246,6 +346,7 @@ function showQuestionModal(question, wallIndex, currentIdx, nextIdx, newX, newY)
                 removeWalls(mazeGrid[currentIdx], mazeGrid[nextIdx]);
                 player.x = newX;
                 player.y = newY;
+                moveLog.push(wallIndex);
               }, 300);
             } else alert("⚠ Wall break limit reached!");
           } else {
@@ -287,18 +388,29 @@ document.addEventListener("keydown", (e) => {
   const nextIdx = newY * cols + newX;
 
   if (mazeGrid[currentIdx].walls[wallIdx[e.key]]) {
-    fetch("/get_question")
-      .then(res => res.json())
-      .then(q => {
-        if (q.error) return alert("No question available!");
-        showQuestionModal(q, wallIdx[e.key], currentIdx, nextIdx, newX, newY);
-      });
+    nextQuestion().then(q => {
+      if (!q) return alert("No question available!");
+      showQuestionModal(q, wallIdx[e.key], currentIdx, nextIdx, newX, newY);
+    });
   } else {
     player.x = newX;
     player.y = newY;
+    moveLog.push(wallIdx[e.key]);
   }
 });
 
+// Moves as 2 bits each (0=up, 1=right, 2=down, 3=left), four per byte
+// from the low bits, base64 encoded -- replayed server-side by verifier.py
+function encodeMoves(moves) {
+  let bytes = "";
+  for (let i = 0; i < moves.length; i += 4) {
+    let b = 0;
+    for (let j = 0; j < 4 && i + j < moves.length; j++) b |= moves[i + j] << (2 * j);
+    bytes += String.fromCharCode(b);
+  }
+  return btoa(bytes);
+}
+
 // ---------------------------------------------------
 // WIN LOGIC — FIXED SUBMIT SCORE
 // ---------------------------------------------------
@@ -318,7 +430,10 @@ function checkWin() {
       body: JSON.stringify({
         score: score,
         walls_broken: wallsBroken,
-        time_left: timeLeft
+        time_left: timeLeft,
+        seed: mazeSeed,
+        moves: encodeMoves(moveLog),
+        move_count: moveLog.length
       })
     })
     .then(() => {
@@ -357,17 +472,8 @@ function drawEndPoint() {
   ctx.shadowBlur = 0;
 }
 
-function gameLoop() {
-  requestAnimationFrame(gameLoop);
-
-  ctx.save();
-  ctx.setTransform(1, 0, 0, 1, 0, 0);
-  ctx.clearRect(0, 0, canvas.width, canvas.height);
-
-  centerMazeOnCanvas();
-  drawMaze();
-
-  // wall break animations
+function drawWallBreaks() {
+  // Each broken wall shrinks towards its far end and fades out
   wallBreakAnimations = wallBreakAnimations.filter(anim => {
     const progress = anim.frame / anim.duration;
     const x1 = anim.cellA.x * cellSize;
@@ -378,30 +484,97 @@ function gameLoop() {
 
     ctx.beginPath();
     switch (anim.wallIndex) {
-      case 0: ctx.moveTo(x1 + cellSize * progress, y1); break;
-      case 1: ctx.moveTo(x1 + cellSize, y1 + cellSize * progress); break;
-      case 2: ctx.moveTo(x1 + cellSize * progress, y1 + cellSize); break;
-      case 3: ctx.moveTo(x1, y1 + cellSize * progress); break;
+      case 0: ctx.moveTo(x1 + cellSize * progress, y1); ctx.lineTo(x1 + cellSize, y1); break;
+      case 1: ctx.moveTo(x1 + cellSize, y1 + cellSize * progress); ctx.lineTo(x1 + cellSize, y1 + cellSize); break;
+      case 2: ctx.moveTo(x1 + cellSize * progress, y1 + cellSize); ctx.lineTo(x1 + cellSize, y1 + cellSize); break;
+      case 3: ctx.moveTo(x1, y1 + cellSize * progress); ctx.lineTo(x1, y1 + cellSize); break;
     }
     ctx.stroke();
 
     anim.frame++;
     return anim.frame <= anim.duration;
   });
+}
 
-  drawEndPoint();
+function gameLoop() {
+  requestAnimationFrame(gameLoop);
+  reportFrameStats();
   checkWin();
+
+  // Nothing moved and nothing is animating: keep the last frame
+  const moved = player.x !== lastPlayer.x || player.y !== lastPlayer.y;
+  if (!(frameDirty || mazeDirty || moved || wallBreakAnimations.length)) return;
+
+  const started = performance.now();
+  ctx.save();
+  ctx.setTransform(1, 0, 0, 1, 0, 0);
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+  centerMazeOnCanvas();
+  drawMaze();
+  drawWallBreaks();
+  drawEndPoint();
   renderPlayer();
 
   ctx.restore();
+  lastPlayer = { x: player.x, y: player.y };
+  frameDirty = false;
+  recordFrame(performance.now() - started);
+}
+
+// ---------------------------------------------------
+// FPS OVERLAY (press F, or open the page with ?fps)
+// ---------------------------------------------------
+
+const frameStats = { ticks: 0, frames: 0, drawMs: 0, maxMs: 0, layerBuilds: 0, since: performance.now() };
+let fpsOverlay = null;
+
+function toggleFpsOverlay() {
+  if (fpsOverlay) {
+    fpsOverlay.remove();
+    fpsOverlay = null;
+    return;
+  }
+  fpsOverlay = document.createElement("div");
+  fpsOverlay.style.cssText = "position:fixed;top:8px;right:8px;z-index:1000;padding:4px 8px;" +
+    "font:12px monospace;color:#0f0;background:rgba(0,0,0,0.7);white-space:pre;pointer-events:none";
+  document.body.appendChild(fpsOverlay);
+}
+
+function recordFrame(ms) {
+  frameStats.frames++;
+  frameStats.drawMs += ms;
+  frameStats.maxMs = Math.max(frameStats.maxMs, ms);
 }
 
+function reportFrameStats() {
+  frameStats.ticks++;
+  const now = performance.now();
+  const elapsed = now - frameStats.since;
+  if (elapsed < 500) return;
+  if (fpsOverlay) {
+    fpsOverlay.textContent =
+      `${(1000 * frameStats.ticks / elapsed).toFixed(0)} fps, ` +
+      `${(1000 * frameStats.frames / elapsed).toFixed(0)} drawn/s\n` +
+      `draw ${(frameStats.frames ? frameStats.drawMs / frameStats.frames : 0).toFixed(2)} ms avg, ` +
+      `${frameStats.maxMs.toFixed(2)} ms max\n` +
+      `${cols}x${rows}, layer rebuilds ${frameStats.layerBuilds}`;
+  }
+  Object.assign(frameStats, { ticks: 0, frames: 0, drawMs: 0, maxMs: 0, since: now });
+}
+
+if (new URLSearchParams(window.location.search).has("fps")) toggleFpsOverlay();
+
+document.addEventListener("keydown", (e) => {
+  if (e.key === "f" || e.key === "F") toggleFpsOverlay();
+});
+
 // ---------------------------------------------------
 
 window.addEventListener("resize", () => {
   canvas.width = window.innerWidth;
   canvas.height = window.innerHeight;
   cellSize = Math.min(canvas.width / cols, canvas.height / rows);
-  centerMazeOnCanvas();
-  drawMaze();
+  mazeDirty = true;
+  frameDirty = true;
 });
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import Response, request # type: ignore
+
+
+class StaticAssets:
+    """Serves the fingerprinted, gzipped copies made by build_static.py.
+
+    install() rewrites url_for('static', filename='game.js') to the copy
+    named in static/dist/manifest.json and wraps the static view so those
+    copies come from memory: gzip when the client accepts it, a strong
+    ETag, and a one-year immutable Cache-Control (a changed file gets a new
+    name). Anything not in the manifest falls through to Flask's handler,
+    and with no manifest (nothing built) install() changes nothing.
+    """
+
+    MAX_AGE = 365 * 24 * 3600
+
+    def __init__(self, static_dir, manifest="dist/manifest.json"):
+        self.static_dir = static_dir
+        self.manifest = {}
+        self._files = {}
+        path = os.path.join(static_dir, manifest)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.manifest = json.load(f)
+            for source, built in self.manifest.items():
+                self._files[built] = self._load(source, built)
+
+    def _load(self, source, built):
+        with open(os.path.join(self.static_dir, built), "rb") as f:
+            plain = f.read()
+        gzipped = None
+        if os.path.exists(os.path.join(self.static_dir, built + ".gz")):
+            with open(os.path.join(self.static_dir, built + ".gz"), "rb") as f:
+                gzipped = f.read()
+            if len(gzipped) >= len(plain):
+                gzipped = None
+        mimetype = mimetypes.guess_type(source)[0] or "application/octet-stream"
+        return plain, gzipped, mimetype, hashlib.sha256(plain).hexdigest()[:16]
+
+    def install(self, app):
+        if not self.manifest:
+            return
+
+        @app.url_defaults
+        def _fingerprint(endpoint, values):
+            if endpoint == 'static' and values.get('filename') in self.manifest:
+                values['filename'] = self.manifest[values['filename']]
+
+        fallback = app.view_functions['static']
+
+        def static(filename):
+            asset = self._files.get(filename)
+            if asset is None:
+                return fallback(filename=filename)
+            return self.response(*asset)
+
+        app.view_functions['static'] = static
+
+    def response(self, plain, gzipped, mimetype, etag):
+        use_gzip = gzipped is not None and 'gzip' in request.accept_encodings
+        response = Response(gzipped if use_gzip else plain, mimetype=mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+            etag += '-gz'
+        response.vary.add('Accept-Encoding')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = self.MAX_AGE
+        response.cache_control.immutable = True
+        return response.make_conditional(request)
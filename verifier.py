@@ -0,0 +1,145 @@
+"""Replays submitted runs against the maze they were played on.
+
+    python verifier.py                   verify pending run_logs until stopped
+    python verifier.py --once            drain the backlog, then exit
+    python verifier.py --workers 8 --batch-size 2000
+
+submit_score only stores the move log (run_logs, status 'pending'); this
+worker does the checking off the request path. Each batch is read in one
+query, fanned out over a process pool (maze generation and replay are
+numpy-bound), and the verdicts are written back with a single executemany.
+Run one instance and scale with --workers; two instances would pick up
+the same pending rows.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mysql.connector # type: ignore
+
+# Holding an arrow key logs one move per key repeat (about 30/s on Windows'
+# default rate); anything well beyond that is scripted
+MAX_MOVES_PER_SECOND = 35
+
+PENDING_SQL = """
+    SELECT id, level, score, walls_broken, time_left,
+           maze_cols, maze_rows, maze_seed, maze_algorithm, moves, move_count
+    FROM run_logs
+    WHERE status = 'pending'
+    ORDER BY id
+    LIMIT %s
+"""
+
+VERDICT_SQL = """
+    UPDATE run_logs
+    SET status = %s, reason = %s, optimal_moves = %s, verified_at = NOW()
+    WHERE id = %s
+"""
+
+
+def verify(job):
+    """Check one run. Returns (status, reason, optimal path length, id).
+
+    Runs in a worker process, so it only touches its argument.
+    """
+    # numpy; imported here so migrate.py can use PENDING_SQL without it
+    import maze_engine
+
+    run_id, level = job['id'], job['level']
+    if level is None:
+        return 'unverifiable', 'unknown level', None, run_id
+    if job['maze_seed'] is None:
+        return 'unverifiable', 'no server-chosen maze for this run', None, run_id
+    if job['maze_algorithm'] != maze_engine.DEFAULT_ALGORITHM:
+        return 'unverifiable', 'maze was not built with %s' % maze_engine.DEFAULT_ALGORITHM, None, run_id
+    if (job['maze_cols'], job['maze_rows']) != (level['cols'], level['rows']):
+        return 'rejected', 'maze size does not match the level', None, run_id
+
+    try:
+        walls = maze_engine.generate(job['maze_cols'], job['maze_rows'], seed=job['maze_seed'],
+                                     algorithm=job['maze_algorithm'])
+        moves = maze_engine.decode_moves(job['moves'], job['move_count'])
+    except (ValueError, TypeError) as e:
+        return 'rejected', 'bad move log: %s' % e, None, run_id
+
+    optimal = maze_engine.shortest_path_length(walls)
+    result = maze_engine.replay(walls, moves)
+    time_used = level['time_limit'] - job['time_left']
+
+    if not result['valid']:
+        reason = 'moves leave the maze'
+    elif not result['reached_exit']:
+        reason = 'moves do not end at the exit'
+    elif result['walls_broken'] != job['walls_broken']:
+        reason = 'walls_broken is %d, replay broke %d' % (job['walls_broken'], result['walls_broken'])
+    elif result['walls_broken'] > level['wall_break_limit']:
+        reason = 'broke %d walls, limit is %d' % (result['walls_broken'], level['wall_break_limit'])
+    elif not 0 <= job['time_left'] <= level['time_limit']:
+        reason = 'time_left out of range'
+    elif job['score'] != job['time_left'] * 10:
+        reason = 'score does not match time_left'
+    # time_left is the client's whole-second countdown, so a run may have
+    # taken up to a second longer than time_used says
+    elif len(moves) > MAX_MOVES_PER_SECOND * (time_used + 1):
+        reason = '%d moves in %ds' % (len(moves), time_used)
+    else:
+        return 'ok', None, optimal, run_id
+    return 'rejected', reason, optimal, run_id
+
+
+def verify_batch(cursor, executor, workers, levels, batch_size):
+    cursor.execute(PENDING_SQL, (batch_size,))
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    jobs = [dict(row, level=levels.get(row['level'])) for row in rows]
+    chunksize = max(1, len(jobs) // (4 * workers))
+    verdicts = list(executor.map(verify, jobs, chunksize=chunksize))
+    cursor.executemany(VERDICT_SQL, verdicts)
+    return verdicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify submitted runs by replaying their move logs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds to wait when there is nothing to do")
+    parser.add_argument("--once", action="store_true", help="exit once no runs are pending")
+    args = parser.parse_args(argv)
+
+    from settings import config, levels
+
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        # spawn, not fork: workers shouldn't inherit this process's MySQL connection
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+            while True:
+                started = time.perf_counter()
+                try:
+                    verdicts = verify_batch(cursor, executor, args.workers, levels, args.batch_size)
+                    conn.commit()
+                except mysql.connector.Error as e:
+                    conn.rollback()
+                    print("🔥 verifier ERROR:", e)
+                    time.sleep(args.interval)
+                    continue
+                if verdicts:
+                    elapsed = time.perf_counter() - started
+                    rejected = sum(1 for v in verdicts if v[0] == 'rejected')
+                    print("verified %d runs (%d rejected) in %.2fs, %.0f runs/s" % (
+                        len(verdicts), rejected, elapsed, len(verdicts) / elapsed if elapsed else 0.0))
+                    continue
+                if args.once:
+                    break
+                time.sleep(args.interval)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()